@@ -15,8 +15,14 @@ import logging
 import logging.handlers
 from pathlib import Path
 from PIL import Image
+import numpy as np
 import subprocess
 import queue
+import concurrent.futures
+import bisect
+import itertools
+import collections
+import mmap
 
 # hardware abstraction layers
 from ghost.hw import audio as hw_audio
@@ -35,15 +41,54 @@ if SIM:
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Low-level I2S guard: ensure GPIO18 is the I2S BCLK (ALT0) before playing
+#   - checked once and cached; SleepState wake clears _bclk_ok to re-verify
+#   - BCM283x/2711: one 32-bit read of GPFSEL1 through /dev/gpiomem
+#   - anything else (Pi 5/RP1, no access): falls back to the pinctrl CLI
 # ──────────────────────────────────────────────────────────────────────────────
+_bclk_ok = False
+
+GPFSEL1_WORD = 1        # GPFSEL1 lives at offset 0x04 → 32-bit word 1
+GPIO18_FSEL_SHIFT = 24  # GPIO18 function select = bits 26:24 of GPFSEL1
+FSEL_ALT0 = 0b100
+_gpiomem = None         # (mmap, uint32 view) kept open once mapped
+
+def _gpiomem_regs():
+    global _gpiomem
+    if _gpiomem is None:
+        compat = Path("/proc/device-tree/compatible").read_bytes()
+        if not any(chip in compat for chip in (b"bcm2835", b"bcm2836", b"bcm2837", b"bcm2711")):
+            raise OSError("not a BCM283x/2711 GPIO block")
+        fd = os.open("/dev/gpiomem", os.O_RDWR | os.O_SYNC)
+        try:
+            mem = mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        _gpiomem = (mem, memoryview(mem).cast("I"))
+    return _gpiomem[1]
+
+def _ensure_bclk_gpiomem():
+    regs = _gpiomem_regs()
+    fsel = regs[GPFSEL1_WORD]
+    if (fsel >> GPIO18_FSEL_SHIFT) & 0b111 != FSEL_ALT0:
+        regs[GPFSEL1_WORD] = (fsel & ~(0b111 << GPIO18_FSEL_SHIFT)) | (FSEL_ALT0 << GPIO18_FSEL_SHIFT)
+        logging.info("Forced GPIO18 to ALT0 (PCM_CLK) via /dev/gpiomem")
+
 def ensure_bclk():
-    if SIM:
+    global _bclk_ok
+    if SIM or _bclk_ok:
         return
+    try:
+        _ensure_bclk_gpiomem()
+        _bclk_ok = True
+        return
+    except OSError as e:
+        logging.debug("ensure_bclk: gpiomem unavailable (%s); using pinctrl", e)
     try:
         out = subprocess.check_output(["pinctrl", "get", "18"], text=True)
         if "a0" not in out.lower():
             subprocess.run(["pinctrl", "set", "18", "a0"], check=False)
             logging.info("Forced GPIO18 to ALT0 (PCM_CLK)")
+        _bclk_ok = True
     except Exception as e:
         logging.debug(f"ensure_bclk skipped: {e}")
 
@@ -87,6 +132,11 @@ CHORD_GRACE_MS = 180     # window to consider near-simultaneous press as a chord
 last_chord_time = 0.0    # Track timing of last chord to suppress late tap decisions
 CHORD_TAP_SUPPRESS_WINDOW = 0.75  # seconds
 
+# Button slots for the edge engine: index 0 = B1, index 1 = B2
+_BUTTONS = ("B1", "B2")
+_BTN_IDX = {"B1": 0, "B2": 1}
+_HOLD_MS_TUPLE = (HOLD_MS_BY_BTN["B1"], HOLD_MS_BY_BTN["B2"])
+
 #Volume control
 def set_pcm_volume(value: int):
     try:
@@ -139,18 +189,59 @@ else:
     BUTTON2_PIN = 27
     BACKLIGHT_PIN = 23
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Asset registry: the preloaded dict, plus which states keep each sheet resident
+#   - keys stored via register() are evicted when a state outside their users
+#     is entered; they are rebuilt lazily by the preload_* helpers
+#   - plain keys (shufflers, flags, wav maps, the idle sheet) are never evicted
+# ──────────────────────────────────────────────────────────────────────────────
+class AssetRegistry(dict):
+    def __init__(self):
+        super().__init__()
+        self._users = {}
+
+    def register(self, key, value, *users):
+        """Store an evictable asset along with the State classes that use it."""
+        self[key] = value
+        self._users[key] = users
+
+    def evict_except(self, state_cls):
+        """Drop registered assets the given state doesn't use."""
+        for key, users in list(self._users.items()):
+            if state_cls in users:
+                continue
+            self._users.pop(key, None)
+            if self.pop(key, None) is not None:
+                log.info("Evicting %s (not used by %s)", key, state_cls.__name__)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Globals
 # ──────────────────────────────────────────────────────────────────────────────
 interrupt_requested = threading.Event()
 shutting_down = threading.Event()
-preloaded = {}
+preloaded = AssetRegistry()
 
 # only allow one aplay at a time (prevents rare overlap / device busy)
 aplay_lock = threading.Lock()
 
-# unified button event queue
-event_queue = queue.Queue()
+# shared workers for side tasks (blocking SFX) that run alongside an animation
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="ghost-worker")
+
+# unified button event queue: fixed-size ring (producers never block) plus a
+# wake flag so the main loop can sleep until something is posted
+event_queue = collections.deque(maxlen=64)
+event_wake = threading.Event()
+
+# display device plus its cleanup hook, looked up once per (re)open
+device = None
+device_cleanup = None
+
+def open_display():
+    """(Re)open the panel on this thread and remember how to release it."""
+    global device, device_cleanup
+    device = hw_display.init_display()
+    device_cleanup = getattr(device, "cleanup", None)
+    return device
 
 # Track last time each button triggered a HOLD (used to suppress immediate 5-tap shutdown)
 last_hold_time = {"B1": 0.0, "B2": 0.0}
@@ -176,12 +267,14 @@ class WeightedHistoryShuffler:
         if not self.items:
             raise ValueError("Shuffler has no items")
 
-        # play tracking
-        self._plays = {i: 0 for i in self.items}
-        self._last_pick_idx = {i: -10**9 for i in self.items}  # "long ago"
+        # play tracking: parallel lists aligned to self.items, plus name → slot
+        n = len(self.items)
+        self._idx = {it: i for i, it in enumerate(self.items)}
+        self._plays = [0] * n
+        self._last_pick_idx = [-10**9] * n  # "long ago"
         self._pick_counter = 0
 
-        # history window to prevent immediate repeats
+        # history window (of slots) to prevent immediate repeats
         from collections import deque
         self._recent = deque(maxlen=recent_window)
 
@@ -190,45 +283,97 @@ class WeightedHistoryShuffler:
         self._age_boost = age_boost
         self._recent_penalty = recent_penalty
         self._min_weight = min_weight
+        self._recent_factor = max(0.0, 1.0 - recent_penalty)
+
+        # cached per-item weights + running prefix sums (bisected in next())
+        self._weights = []
+        self._cum = []
+        self._refresh_weights()
 
-    def _weight(self, item: str) -> float:
+    def _weight(self, i: int) -> float:
+        plays = self._plays[i]
         # age in "picks since last played"
-        age = max(0, self._pick_counter - self._last_pick_idx[item])
-        unheard = 1.0 if self._plays[item] == 0 else 0.0
+        age = max(0, self._pick_counter - self._last_pick_idx[i])
+        unheard = 1.0 if plays == 0 else 0.0
         # base preference: inverse with plays so underplayed items get love
-        base = 1.0 / (1.0 + self._plays[item])
+        base = 1.0 / (1.0 + plays)
 
         # build weight
         w = base * (1.0 + self._unheard_boost * unheard) * (1.0 + self._age_boost * age)
 
         # small penalty if the item is in the recent window
-        if item in self._recent:
-            w *= max(0.0, 1.0 - self._recent_penalty)
+        if i in self._recent:
+            w *= self._recent_factor
 
         # never drop to zero
         return max(self._min_weight, w)
 
-    def _note_pick(self, item: str):
-        self._plays[item] += 1
-        self._last_pick_idx[item] = self._pick_counter
-        self._recent.append(item)
+    def _note_pick(self, i: int):
+        self._plays[i] += 1
+        self._last_pick_idx[i] = self._pick_counter
+        self._recent.append(i)
         self._pick_counter += 1
+        self._refresh_weights()
+
+    def _refresh_weights(self):
+        # every item's age moves on each pick, so all slots are refreshed here
+        # (N is tiny) and next() only has to do a single bisect
+        self._weights = [self._weight(i) for i in range(len(self.items))]
+        self._cum = list(itertools.accumulate(self._weights))
 
     def observe(self, item: str):
         """Record an externally chosen item as if it were picked (keeps history sane)."""
-        if item not in self._plays:
+        i = self._idx.get(item)
+        if i is None:
             raise ValueError(f"Unknown item observed: {item}")
-        self._note_pick(item)
+        self._note_pick(i)
 
     def next(self) -> str:
-        weights = [self._weight(i) for i in self.items]
-        choice = random.choices(self.items, weights=weights, k=1)[0]
-        self._note_pick(choice)
-        return choice
+        i = bisect.bisect_right(self._cum, random.random() * self._cum[-1], 0, len(self._cum) - 1)
+        self._note_pick(i)
+        return self.items[i]
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Column cycler: walks a shuffled permutation of 0..n-1, reshuffling per pass
+#   - every column shows once per pass, with no back-to-back repeat even
+#     across the reshuffle boundary
+#   - one shuffle per n picks instead of an RNG draw per pick
+# ──────────────────────────────────────────────────────────────────────────────
+class ColumnCycler:
+    def __init__(self, n: int):
+        self.n = n
+        self.buf = list(range(n))
+        self.i = n
+        self._last = None
+
+    def next(self) -> int:
+        if self.i >= self.n:
+            random.shuffle(self.buf)
+            if self.n > 1 and self.buf[0] == self._last:
+                self.buf[0], self.buf[-1] = self.buf[-1], self.buf[0]
+            self.i = 0
+        v = self.buf[self.i]
+        self.i += 1
+        self._last = v
+        return v
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Assets
 # ──────────────────────────────────────────────────────────────────────────────
+def preload_wav_bytes(names):
+    """mmap each WAV once so play_audio can pipe it to aplay instead of reopening the file."""
+    if SIM:
+        return  # afplay only takes paths
+    wavs = preloaded.setdefault("wav_bytes", {})
+    for name in names:
+        if name in wavs:
+            continue
+        try:
+            with open(AUDIO_PATH / name, "rb") as f:
+                wavs[name] = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+        except Exception as e:
+            log.warning("WAV preload skipped for %s: %s", name, e)
+
 def preload_idle_assets():
     log.info("Preloading IdleState assets")
     preloaded["idle_animator"] = SpriteAnimator(ANIM_PATH / "idle.bmp", 5, 36)
@@ -256,11 +401,26 @@ def preload_sing_assets():
         preloaded["sing_sounds"] = {
             name: pygame.mixer.Sound(str(AUDIO_PATH / name)) for name in songs
         }
+    else:
+        preload_wav_bytes(songs)
     log.info(f"Sing assets ready: {len(songs)} file(s), shuffled playback")
 
+# Serializes quip-sheet builds so a state that needs it right now waits for
+# an in-flight background build instead of decoding a second copy
+_quip_sheet_lock = threading.Lock()
+
+def load_quip_sheet():
+    """Build active.bmp into preloaded unless it's already resident."""
+    with _quip_sheet_lock:
+        if "quip_animator" in preloaded:
+            return
+        # plain key, never evicted: Idle, Sing, Quip and Story all sit a tap
+        # apart, and rebuilding it after each song would cost more than it saves
+        preloaded["quip_animator"] = SpriteAnimator(ANIM_PATH / "active.bmp", 10, 36)
+
 def preload_quip_assets():
     log.info("Preloading QuipState assets")
-    preloaded["quip_animator"] = SpriteAnimator(ANIM_PATH / "active.bmp", 10, 36)
+    load_quip_sheet()
 
     # List your quip files here
     quip_files = [
@@ -291,15 +451,61 @@ def preload_quip_assets():
         preloaded["quip_sounds"] = {
             name: pygame.mixer.Sound(str(AUDIO_PATH / name)) for name in quip_files
         }
+    else:
+        preload_wav_bytes(quip_files)
 
     log.info(f"Quip assets ready: {len(quip_files)} files, 10 columns, shuffled playback")
 
+def preload_fx_assets():
+    log.info("Preloading SFX")
+    # short clips fired straight from button events (dispatcher, dice, story)
+    fx_files = [
+    "fx/roll.wav", "fx/guardiandown.wav", "fx/crit.wav", "fx/beep.wav",
+    "fx/revive.wav", "fx/story.wav", "quips/eyesupguardian.wav"
+]
+    if USE_APLAY:
+        preload_wav_bytes(fx_files)
+    log.info("SFX ready: %d file(s)", len(fx_files))
+
+# Pre-drawn die rolls: one deque per die, topped up on _pool once half used
+ROLL_BATCH = 256
+_sysrand = random.SystemRandom()
+
+def _fill_rolls(ring, max_val):
+    ring.extend(_sysrand.randint(1, max_val) for _ in range(ROLL_BATCH))
+
 def preload_result_assets():
-    log.info("Preloading dice result sheet")
-    preloaded["result_animator"] = SpriteAnimator(
-        ANIM_PATH / "results.bmp",
-        columns=100,
-        frames_per_column=7  # 0..6
+    log.info("Preloading dice sheets")
+    # largest sheet by far (100 columns); only resident while in DiceState
+    preloaded.register(
+        "result_animator",
+        SpriteAnimator(
+            ANIM_PATH / "results.bmp",
+            columns=100,
+            frames_per_column=7  # 0..6
+        ),
+        DiceState
+    )
+    # dice.bmp has 23 frames/col: 0..22 (0..3 preview, 4..22 roll)
+    dice = SpriteAnimator(
+        ANIM_PATH / "dice.bmp",
+        columns=7,
+        frames_per_column=23
+    )
+    preloaded.register("dice_animator", dice, DiceState)
+    if "dice_rolls" not in preloaded:
+        rolls = []
+        for max_val in DiceState.MAX_VALS:
+            ring = collections.deque()
+            _fill_rolls(ring, max_val)
+            rolls.append(ring)
+        preloaded.register("dice_rolls", rolls, DiceState)
+    # ready-to-push preview buffers (frames 0..3) per column for the rewind
+    preloaded.register(
+        "dice_frames",
+        [tuple(dice.get_panel_buffer(c, i) for i in range(4))
+         for c in range(dice.columns)],
+        DiceState
     )
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -307,17 +513,55 @@ def preload_result_assets():
 # ──────────────────────────────────────────────────────────────────────────────
 class SpriteAnimator:
     def __init__(self, bmp_path, columns, frames_per_column):
-        self.image = Image.open(bmp_path).convert("RGB")
         self.frame_width = 240
         self.frame_height = 240
         self.columns = columns
         self.frames_per_column = frames_per_column
         self.filename = os.path.basename(bmp_path)
 
-    def get_frame(self, col, row):
-        x = col * self.frame_width
-        y = row * self.frame_height
-        return self.image.crop((x, y, x + self.frame_width, y + self.frame_height))
+        # Decode once into a NumPy buffer and close the PIL sheet right away;
+        # only the re-laid frame block below stays resident
+        self._palette = None
+        with Image.open(bmp_path) as src:
+            if src.mode in ("P", "L"):
+                # 8-bit sheet: keep 1 byte/pixel plus a 256×3 palette and expand
+                # to RGB only for frames being shown (⅓ of the resident memory)
+                self._palette = np.zeros((256, 3), dtype=np.uint8)
+                if src.mode == "P":
+                    lut = np.asarray(src.getpalette() or [], dtype=np.uint8).reshape(-1, 3)[:256]
+                    self._palette[:len(lut)] = lut
+                else:
+                    self._palette[:] = np.arange(256, dtype=np.uint8)[:, None]
+                sheet = np.asarray(src, dtype=np.uint8)
+            else:
+                sheet = np.asarray(src.convert("RGB"), dtype=np.uint8)
+
+        # Re-lay the sheet once as (column, row, h, w[, rgb]) so every frame is
+        # its own contiguous block, already in the panel's scan layout
+        # (hw_display.to_panel, i.e. luma's rotate applied): frames are then
+        # views, with no crop or rotation per push. One copy for both steps.
+        w, h = self.frame_width, self.frame_height
+        sheet = sheet[:frames_per_column * h, :columns * w]
+        block = sheet.reshape((frames_per_column, h, columns, w) + sheet.shape[2:]) \
+                     .transpose((2, 0, 1, 3) + tuple(range(4, sheet.ndim + 2)))
+        self._frames = np.ascontiguousarray(hw_display.to_panel(device, block, axes=(2, 3)))
+        # indexed sheets: palette-expanded frames of the active column only
+        self._panel_col = None
+        self._panel_rows = {}
+
+    def get_panel_buffer(self, col, row):
+        # one frame in the panel's own layout, ready for show_panel()
+        if self._palette is None:
+            return self._frames[col, row]  # a view, no copy
+        # indexed sheet: palette gather, built once per row while its column plays
+        if col != self._panel_col:
+            self._panel_col = col
+            self._panel_rows = {}
+        buf = self._panel_rows.get(row)
+        if buf is None:
+            buf = self._palette[self._frames[col, row]]
+            self._panel_rows[row] = buf
+        return buf
 
     def play_column(self, col, start=0, end=None, loop=False, interruptable=False, hold_last=False):
         if end is None:
@@ -325,44 +569,113 @@ class SpriteAnimator:
         index = start
         # one-line log per call
         log.info(f"[anim {self.filename}] col={col} range={start}->{end} loop={loop} interruptable={interruptable}")
-        while not interrupt_requested.is_set():
-            frame = self.get_frame(col, index)
-            hw_display.show_image(device, frame)
+        # bind the per-frame calls once and resolve the column's buffers up
+        # front; the loop body is then a list index, one push and a sleep
+        get_buffer = self.get_panel_buffer
+        show_panel = hw_display.show_panel
+        interrupted = interrupt_requested.is_set
+        frames = [get_buffer(col, i) for i in range(start, end)]
+        n = len(frames)
+        # integer-ns monotonic deadline so show/pump time doesn't accumulate as drift
+        monotonic_ns = time.monotonic_ns
+        period_ns = int(FRAME_RATE * 1_000_000_000)
+        deadline = monotonic_ns()
+        i = 0
+        while i < n and not interrupted():
+            show_panel(device, frames[i])
             # keep the SIM responsive (must be main thread)
             if SIM:
                 pump_sim_inputs_once()
                 dispatch_events()
-            time.sleep(FRAME_RATE)
-            index += 1
-            if index >= end:
+            deadline += period_ns
+            dt = deadline - monotonic_ns()
+            if dt > 0:
+                time.sleep(dt / 1_000_000_000)
+            i += 1
+            if i >= n:
                 if loop:
-                    index = start
+                    i = 0
                 else:
                     break
-            if interruptable and interrupt_requested.is_set():
+            if interruptable and interrupted():
                 break
+        index = start + i
         if hold_last and index > 0:
-            frame = self.get_frame(col, index - 1)
-            hw_display.show_image(device, frame)
+            show_panel(device, get_buffer(col, index - 1))
         return index
 
+def play_sequence(segments, hold_last=False):
+    """
+    Play several (animator, col, start, end) strips back to back on one frame
+    clock. Plain callables in the list run when reached (e.g. a sound cue).
+    Stops on interrupt; returns (animator, col, frame) last pushed, or None.
+    """
+    frames = []
+    for seg in segments:
+        if callable(seg):
+            frames.append((seg, None))
+            continue
+        animator, col, start, end = seg
+        log.info("[anim %s] col=%s range=%s->%s (sequence)", animator.filename, col, start, end)
+        get_buffer = animator.get_panel_buffer
+        frames.extend((get_buffer(col, i), (animator, col, i)) for i in range(start, end))
+
+    show_panel = hw_display.show_panel
+    interrupted = interrupt_requested.is_set
+    monotonic_ns = time.monotonic_ns
+    period_ns = int(FRAME_RATE * 1_000_000_000)
+    deadline = monotonic_ns()
+    last = None
+    for buf, key in frames:
+        if interrupted():
+            break
+        if key is None:
+            buf()  # cue: no frame, no tick
+            continue
+        show_panel(device, buf)
+        last = (buf, key)
+        # keep the SIM responsive (must be main thread)
+        if SIM:
+            pump_sim_inputs_once()
+            dispatch_events()
+        deadline += period_ns
+        dt = deadline - monotonic_ns()
+        if dt > 0:
+            time.sleep(dt / 1_000_000_000)
+    if last is None:
+        return None
+    if hold_last:
+        show_panel(device, last[0])
+    return last[1]
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Audio
 # ──────────────────────────────────────────────────────────────────────────────
+def _audio_source(filename):
+    """Preloaded WAV buffer for `filename` if we have one, else its path (None if missing)."""
+    wav = preloaded.get("wav_bytes", {}).get(filename)
+    if wav is not None:
+        return wav
+    path = AUDIO_PATH / filename
+    if not path.exists():
+        log.warning("Audio file not found: %s", path)
+        return None
+    return str(path)
+
 def play_audio(filename, interruptable=False):
     """
     Unified playback through the hardware adapter.
     - SIM (Mac): afplay
-    - Pi: aplay
+    - Pi: aplay (piped from the preloaded mmap when available)
     """
-    path = AUDIO_PATH / filename
-    if not path.exists():
-        log.warning(f"Audio file not found: {path}")
+    src = _audio_source(filename)
+    if src is None:
         return
+    path = AUDIO_PATH / filename
     if not SIM:
         ensure_bclk()
     try:
-        hw_audio.play_wav(str(path))  # SIM→afplay, Pi→aplay
+        hw_audio.play_wav(src)  # SIM→afplay, Pi→aplay
         return
     except Exception as e:
         log.warning(f"Audio playback failed via hw adapter: {e}")
@@ -384,6 +697,26 @@ def play_audio(filename, interruptable=False):
         except Exception as e:
             log.error(f"pygame playback failed: {e}")
 
+def play_audio_async(filename):
+    """
+    Start playback through the hardware adapter without waiting.
+    Returns the player handle (poll() is None while it plays) or None if
+    nothing could be started; stop it early with hw_audio.stop(handle).
+    """
+    src = _audio_source(filename)
+    if src is None:
+        return None
+    if not SIM:
+        ensure_bclk()
+    try:
+        return hw_audio.play_wav_async(src)
+    except Exception as e:
+        log.warning("Audio playback failed via hw adapter: %s", e)
+        return None
+
+def audio_playing(proc) -> bool:
+    return proc is not None and proc.poll() is None
+
 # ──────────────────────────────────────────────────────────────────────────────
 # State base & manager
 # ──────────────────────────────────────────────────────────────────────────────
@@ -393,30 +726,69 @@ class State:
     def handle_event(self, evt: str):
         pass
 
+    def idle_wait(self, evt, timeout):
+        """
+        Block in run() until `evt` is set, `timeout` passes, or this state is
+        replaced; True unless it timed out. On SIM run() is inline on the main
+        thread, so this yields back to the main loop's input/dispatch tick
+        instead of going deaf for the whole wait.
+        """
+        if not SIM:
+            return evt.wait(timeout)
+        end = time.monotonic() + timeout
+        while not evt.is_set() and manager.state is self:
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            if not (pump_sim_inputs_once() | dispatch_events()):
+                evt.wait(min(0.016, left))
+        return True
+
 class StateManager:
     def __init__(self):
         self.state = None
         self.thread = None
         self.lock = threading.Lock()
-        self.next_state = None
+        # switch requests from state threads, delivered to the main loop once each
+        self.requests = queue.SimpleQueue()
         self._inline_running = False
 
+    def request(self, state_cls):
+        """Ask the main loop to switch states (from a state's own run())."""
+        self.requests.put_nowait(state_cls)
+        event_wake.set()  # main loop is parked on this; switch without waiting out its timeout
+
+    def drop_requests(self):
+        """Discard pending request()s; they came from a state that's been replaced."""
+        while True:
+            try:
+                self.requests.get_nowait()
+            except queue.Empty:
+                return
+
     def set_state(self, state_cls):
         with self.lock:
             interrupt_requested.set()
             if self.thread and self.thread.is_alive() and threading.current_thread() != self.thread:
                 log.info(f"Waiting for {self.state.__class__.__name__} to stop")
                 self.thread.join()
-            interrupt_requested.clear()
+            if not (SIM and self._inline_running):
+                interrupt_requested.clear()
+            # else: the old run() is still on this (main) thread's stack, above
+            # the dispatch that got us here; leave the flag up so it unwinds,
+            # and the main loop clears it before starting the new run()
+
+            # whatever the outgoing state asked for while winding down (e.g. its
+            # interrupt path's request(IdleState)) is stale once we're switching
+            self.drop_requests()
 
             # Drop queued events
-            try:
-                while True:
-                    event_queue.get_nowait()
-            except Exception:
-                pass
+            event_queue.clear()
 
             log.info(f"Entering {state_cls.__name__}")
+            # evict first so the old state's sheets are gone before the new
+            # state's load (no peak with both sets resident)
+            preloaded.evict_except(state_cls)
             self.state = state_cls()
 
             if SIM:
@@ -436,28 +808,14 @@ class BootState(State):
         ensure_bclk()
         animator = SpriteAnimator(ANIM_PATH / "awaken.bmp", 1, 36)
 
-        # play audio & animation in parallel
-        def anim():
-            animator.play_column(0)
-
-        def audio():
-            play_audio("quips/eyesupguardian.wav", interruptable=False)
-
+        # play audio & animation in parallel: audio on the pool, animation
+        # inline (main thread on SIM, state thread on Pi)
         log.info("Boot: starting audio + animation concurrently")
-        t_audio = threading.Thread(target=audio, daemon=True)
-        t_audio.start()
-        if SIM:
-            # Animate inline on main thread
-            animator.play_column(0)
-            t_audio.join()
-        else:
-            # Pi: thread is fine
-            t_anim = threading.Thread(target=lambda: animator.play_column(0), daemon=True)
-            t_anim.start()
-            t_anim.join()
-            t_audio.join()
+        f_audio = _pool.submit(play_audio, "quips/eyesupguardian.wav", interruptable=False)
+        animator.play_column(0)
+        concurrent.futures.wait([f_audio])
 
-        manager.next_state = IdleState
+        manager.request(IdleState)
 
 class IdleState(State):
     def run(self):
@@ -466,9 +824,10 @@ class IdleState(State):
             preload_idle_assets()
 
         animator = preloaded["idle_animator"]
+        cols = ColumnCycler(animator.columns)
         while not interrupt_requested.is_set():
-            col = random.randint(0, 4)
-            log.info(f"Idle: choosing column {col}")
+            col = cols.next()
+            log.debug("Idle: choosing column %s", col)
             animator.play_column(col, interruptable=True)
 
     def handle_event(self, evt: str):
@@ -504,71 +863,42 @@ class SingState(State):
         # Use dedicated animator for singing
         animator = SpriteAnimator(ANIM_PATH / "sing.bmp", 6, 36)
 
-        audio_done = threading.Event()
-        column_lock = threading.Lock()
-        current_col = [random.randint(0, 5)]
+        cols = ColumnCycler(animator.columns)
+        col = None
         frame_index = 0
 
-        def animate():
-            nonlocal frame_index
-            while not interrupt_requested.is_set() and not audio_done.is_set():
-                with column_lock:
-                    current_col[0] = random.randint(0, 5)
-                    log.info(f"Sing: choosing column {current_col[0]}")
-                    frame_index = 0
-                returned_index = animator.play_column(
-                    current_col[0],
-                    start=frame_index,
-                    end=animator.frames_per_column,
-                    interruptable=True
-                )
-                frame_index = min(returned_index, animator.frames_per_column)
-
-        def play_audio_and_flag():
-            log.info(f"Playing song: {name}")
-            play_audio(name, interruptable=True)
-            if not interrupt_requested.is_set():
-                audio_done.set()
-
-        # Start animation + audio
-        audio_thread = threading.Thread(target=play_audio_and_flag, daemon=True)
-        audio_thread.start()
-        if SIM:
-            # Animate inline on main thread while audio plays
-            while not interrupt_requested.is_set() and not audio_done.is_set():
-                with column_lock:
-                    current_col[0] = random.randint(0, 5)
-                    log.info(f"Sing: choosing column {current_col[0]}")
-                    frame_index = 0
-                returned_index = animator.play_column(
-                    current_col[0],
-                    start=frame_index,
-                    end=animator.frames_per_column,
-                    interruptable=True
-                )
-                frame_index = min(returned_index, animator.frames_per_column)
-            audio_thread.join()
-        else:
-            anim_thread = threading.Thread(target=animate, daemon=True)
-            anim_thread.start()
-            audio_thread.join()
-            anim_thread.join()
+        # Start audio without blocking; the player handle doubles as the "done" flag
+        log.info("Playing song: %s", name)
+        proc = play_audio_async(name)
+
+        # Animate until the song ends (inline: main thread on SIM, state thread on Pi)
+        while not interrupt_requested.is_set() and audio_playing(proc):
+            col = cols.next()
+            log.debug("Sing: choosing column %s", col)
+            returned_index = animator.play_column(
+                col,
+                start=0,
+                end=animator.frames_per_column,
+                interruptable=True
+            )
+            frame_index = min(returned_index, animator.frames_per_column)
 
         if interrupt_requested.is_set():
             log.info("Interrupt detected in SingState — exiting early")
-            manager.next_state = IdleState
+            hw_audio.stop(proc)
+            manager.request(IdleState)
             return
 
-        # Play the remaining frames in the last column
-        with column_lock:
+        # Play the remaining frames in the last column (if one was started)
+        if col is not None and frame_index < animator.frames_per_column:
             animator.play_column(
-                current_col[0],
+                col,
                 start=frame_index,
                 end=animator.frames_per_column,
                 interruptable=False
             )
 
-        manager.next_state = IdleState
+        manager.request(IdleState)
 
 class SleepState(State):
     """
@@ -584,6 +914,7 @@ class SleepState(State):
         self.sleep_tap_window = 0.6
         self.settle_until = time.monotonic() + 0.5  # ignore edges that caused entry. OG .25
         self.wake_requested = False
+        self._wake_evt = threading.Event()
 
     def run(self):
         global device
@@ -594,11 +925,13 @@ class SleepState(State):
         except Exception:
             pass
 
-        # Do nothing here—just stay alive until we get a wake event.
-        # All wake logic happens in handle_event().
-        while not shutting_down.is_set() and not self.wake_requested:
-            time.sleep(0.05)
-        
+        # Do nothing here—just block until we get a wake event.
+        # All wake logic happens in handle_event(); the timeout only bounds
+        # how long a shutdown can go unnoticed.
+        while not shutting_down.is_set():
+            if self.idle_wait(self._wake_evt, 1.0):
+                break
+
         log.info("SleepState exiting — handoff complete")
 
     def _wake(self, source: str):
@@ -606,7 +939,7 @@ class SleepState(State):
             log.info(f"Ignoring duplicate wake request via {source}")
             return  # Already waking or shutting down
         self.wake_requested = True
-
+        self._wake_evt.set()
 
         log.info(f"Waking up from SleepState via {source} — turning on backlight and rebooting UI")
 
@@ -617,20 +950,24 @@ class SleepState(State):
         except Exception as e:
             log.debug(f"SleepState: backlight re-assert failed: {e}")
 
-        global device
+        # re-verify the I2S clock pin on the next playback after wake
+        global _bclk_ok
+        _bclk_ok = False
+
         try:
             try:
-                if device and hasattr(device, "cleanup"):
-                    device.cleanup()
+                if device_cleanup:
+                    hw_display.flush()
+                    device_cleanup()
             except Exception as e:
                 log.debug(f"SleepState: device.cleanup() skipped: {e}")
 
-            device = hw_display.init_display()
+            open_display()
         except Exception as e:
             log.warning(f"SleepState: display reinit failed: {e}")
 
         interrupt_requested.set()
-        manager.next_state = BootState
+        manager.request(BootState)
 
     def handle_event(self, evt: str):
         # Ignore any events for a brief moment after entering sleep
@@ -682,24 +1019,23 @@ class ShutdownState(State):
                 GPIO.output(24, GPIO.HIGH)
                 log.info("Display RESET pin pulsed to blank screen before shutdown")
             except Exception as e:
-                log.warning(f"Could not reset display: {e}")
+                log.warning("Could not reset display: %s", e)
 
             try:
                 # Redundant backlight off again (after RESET, in case it turned on)
                 GPIO.output(BACKLIGHT_PIN, GPIO.LOW)
                 log.info("Backlight explicitly turned off again before shutdown")
             except Exception as e:
-                log.warning(f"Second backlight-off failed: {e}")
+                log.warning("Second backlight-off failed: %s", e)
 
             try:
                 log.info("Executing system shutdown...")
-                os.system("sudo shutdown now")
+                subprocess.Popen(["sudo", "shutdown", "now"], close_fds=True)
             except Exception as e:
-                log.error(f"Shutdown command failed: {e}")
+                log.error("Shutdown command failed: %s", e)
 
         # Stay alive until the system shuts down (or interrupted)
-        while not shutting_down.is_set():
-            time.sleep(0.1)
+        shutting_down.wait()
 
         log.info("ShutdownState exiting (should never happen unless interrupted)")
 
@@ -714,53 +1050,43 @@ class StoryState(State):
 
         if "quip_animator" not in preloaded:
             log.warning("StoryState: quip_animator not preloaded — loading now")
-            preload_quip_assets()
+            load_quip_sheet()  # (waits on a background build if one is running)
 
         animator = preloaded["quip_animator"]
 
-        audio_done = threading.Event()
-        current_col = [random.randint(0, animator.columns - 1)]
+        cols = ColumnCycler(animator.columns)
+        col = cols.next()
         frame_index = 0
 
-        def animate():
-            nonlocal frame_index
-            # Keep playing columns until audio_done is set
-            while not interrupt_requested.is_set() and not audio_done.is_set():
-                frame_index = 0
-                col = current_col[0]
-                frame_index = animator.play_column(
-                    col,
-                    start=0,
-                    end=animator.frames_per_column,
-                    interruptable=True
-                )
-                if audio_done.is_set() or interrupt_requested.is_set():
-                    break
-                # pick a new column for the next loop
-                current_col[0] = random.randint(0, animator.columns - 1)
-
-            # Audio ended (or was interrupted): finish the current column cleanly
-            if not interrupt_requested.is_set() and frame_index < animator.frames_per_column:
-                animator.play_column(
-                    current_col[0],
-                    start=frame_index,
-                    end=animator.frames_per_column,
-                    interruptable=False
-                )
-
-        def play_and_flag():
-            play_audio("fx/story.wav", interruptable=True)
-            if not interrupt_requested.is_set():
-                audio_done.set()
-
-        t_anim = threading.Thread(target=animate, daemon=True)
-        t_audio = threading.Thread(target=play_and_flag, daemon=True)
-        t_anim.start()
-        t_audio.start()
-        t_audio.join()
-        t_anim.join()
-
-        manager.next_state = IdleState
+        # Start audio without blocking; the player handle doubles as the "done" flag
+        proc = play_audio_async("fx/story.wav")
+
+        # Keep playing columns until the audio ends
+        # (inline: main thread on SIM, state thread on Pi)
+        while not interrupt_requested.is_set() and audio_playing(proc):
+            frame_index = animator.play_column(
+                col,
+                start=0,
+                end=animator.frames_per_column,
+                interruptable=True
+            )
+            if not audio_playing(proc) or interrupt_requested.is_set():
+                break
+            # pick a new column for the next loop
+            col = cols.next()
+
+        if interrupt_requested.is_set():
+            hw_audio.stop(proc)
+        # Audio ended: finish the current column cleanly
+        elif frame_index < animator.frames_per_column:
+            animator.play_column(
+                col,
+                start=frame_index,
+                end=animator.frames_per_column,
+                interruptable=False
+            )
+
+        manager.request(IdleState)
 
 class DiceState(State):
     # Map selected_index → max value for that die
@@ -777,127 +1103,167 @@ class DiceState(State):
         # --- settle window to ignore stale edges from the entry chord ---
         self.settle_until = time.monotonic() + 0.25
 
-        # --- assets ---
-        if "result_animator" not in preloaded:
+        # --- assets: loaded by run() (state thread), not here on the dispatcher ---
+        self.dice_animator = None
+        self.dice_frames = None
+        self.dice_rolls = None
+        self.result_animator = None
+        self._ready = False              # handle_event() ignores input until set
+        # (animator, col, frame) currently on the panel; skip re-sending it
+        self._last_shown = None
+
+    def _load_assets(self):
+        if "result_animator" not in preloaded or "dice_frames" not in preloaded or "dice_rolls" not in preloaded:
             preload_result_assets()
-        # dice.bmp has 23 frames/col: 0..22 (0..3 preview, 4..22 roll)
-        self.dice_animator = SpriteAnimator(
-            ANIM_PATH / "dice.bmp",
-            columns=7,
-            frames_per_column=23
-        )
+        self.dice_animator = preloaded["dice_animator"]
+        self.dice_frames = preloaded["dice_frames"]
+        self.dice_rolls = preloaded["dice_rolls"]
         # results.bmp preloaded to 7 frames/col: 0..6
         self.result_animator = preloaded["result_animator"]
+        self._ready = True
+
+    def _blit(self, col, idx):
+        """Push one dice preview frame unless it's already on the panel."""
+        key = (self.dice_animator, col, idx)
+        if key == self._last_shown:
+            return
+        hw_display.show_panel(device, self.dice_frames[col][idx])
+        self._last_shown = key
+
+    def _play(self, segments, hold_last=False):
+        """play_sequence, minus a leading frame that's already showing."""
+        for n, seg in enumerate(segments):
+            if callable(seg):
+                continue
+            animator, col, start, end = seg
+            if self._last_shown == (animator, col, start):
+                segments = segments[:n] + [(animator, col, start + 1, end)] + segments[n + 1:]
+            break
+        shown = play_sequence(segments, hold_last=hold_last)
+        if shown is not None:
+            self._last_shown = shown
+
+    def _selection_strip(self):
+        """Preview = dice.bmp frames 0..3 of the selected die (caller holds the last)."""
+        log.info("Dice: preview column %s", self.selected_index)
+        return [(self.dice_animator, self.selected_index, 0, 4)]
 
     def _show_selection(self):
-        log.info(f"Dice: preview column {self.selected_index}")
-        # Preview = frames 0..3, hold last
-        self.dice_animator.play_column(
-            self.selected_index,
-            start=0,
-            end=4,
-            interruptable=False,
-            hold_last=True
-        )
+        if self._last_shown == (self.dice_animator, self.selected_index, 3):
+            log.info("Dice: preview column %s already showing", self.selected_index)
+            return
+        self._play(self._selection_strip(), hold_last=True)
 
-    def _play_result_strip(self, start_frame=3):
+    def _result_strip(self, start_frame=3):
         """
-        Play the result strip from start_frame through frame 6 (inclusive).
-        - start_frame=0 → play full strip 0..6 (would be used if you wanted full replay)
-        - start_frame=3 → play tail 3..6 (used before returning to selection or reroll)
+        Segments for the result strip from start_frame through frame 6 (inclusive).
+        - start_frame=0 → full strip 0..6 (would be used if you wanted full replay)
+        - start_frame=3 → tail 3..6 (played before returning to selection or reroll)
         """
         if self.last_result is None:
-            return
+            return []
         col = self.last_result - 1  # 1..100 → 0..99
         start = 0 if start_frame <= 0 else (3 if start_frame <= 3 else start_frame)
-        log.info(f"Dice: playing result strip (frames {start}..6)")
-        self.result_animator.play_column(
-            col,
-            start=start,
-            end=7,             # end exclusive → plays up to frame 6
-            interruptable=False,
-            hold_last=False
-        )
+        log.info("Dice: playing result strip (frames %s..6)", start)
+        return [(self.result_animator, col, start, 7)]  # end exclusive → up to frame 6
 
-    def _roll_current(self):
+    def _next_roll(self, die):
+        """Pop a pre-drawn roll for one die; refill in the background at half."""
+        ring = self.dice_rolls[die]
+        try:
+            value = ring.popleft()
+        except IndexError:
+            # refill hasn't landed yet (only possible under a burst of rolls)
+            return _sysrand.randint(1, self.MAX_VALS[die])
+        if len(ring) == ROLL_BATCH // 2:
+            _pool.submit(_fill_rolls, ring, self.MAX_VALS[die])
+        return value
+
+    def _roll_current(self, lead_in=()):
         """
         Rolls the currently selected die:
+        - Plays lead_in segments first (e.g. the previous result's tail), same frame clock
         - Plays roll sfx (fx/roll.wav)
         - Plays dice.bmp frames 4..22 for the selected column
         - Shows results.bmp frames 0..3 (hold on 3)
         - Enters 'result' mode
         """
         name = self.dice_names[self.selected_index]
-        log.info(f"Dice: rolling {name}")
+        log.info("Dice: rolling %s", name)
 
-        audio_done = threading.Event()
+        sfx = []
 
-        def play_roll_audio():
-            play_audio("fx/roll.wav", interruptable=True)
-            audio_done.set()
+        def start_sfx():
+            # async: the clip runs under the animation; we wait on it after
+            sfx.append(play_audio_async("fx/roll.wav"))
 
-        audio_thread = threading.Thread(target=play_roll_audio, daemon=True)
-        audio_thread.start()
+        # Animate roll (frames 4..22), with the sfx cued as it starts.
+        # If user interrupts, bail gracefully.
+        log.info("Dice: rolling anim col %s (4->23)", self.selected_index)
+        self._play(list(lead_in) + [start_sfx, (self.dice_animator, self.selected_index, 4, 23)])
 
-        # Animate roll (frames 4..22). If user interrupts, bail gracefully.
-        log.info(f"Dice: rolling anim col {self.selected_index} (4->23)")
-        self.dice_animator.play_column(
-            self.selected_index,
-            start=4,
-            end=23,                # 0..22 → end=23
-            interruptable=True
-        )
-
-        audio_thread.join()
+        proc = sfx[0] if sfx else None
         if interrupt_requested.is_set():
+            if proc is not None:
+                hw_audio.stop(proc)  # roll animation was cut short: cut its sound too
             log.info("Dice: interrupted during roll → remain in selection")
             self.mode = "selection"
             self._show_selection()
             return
 
+        # reveal only once the roll sound is done: block on the player handle
+        if proc is not None:
+            try:
+                proc.wait()
+            except Exception as e:
+                log.debug("Dice: roll SFX wait failed: %s", e)
+
         # Decide a result and show first half (0..3, hold)
-        self.last_result = random.randint(1, self.MAX_VALS[self.selected_index])
-        log.info(f"Dice: displaying result {self.last_result} (frames 0..3, hold)")
-        self.result_animator.play_column(
-            self.last_result - 1,  # column
-            start=0,
-            end=4,                  # show 0..3 and hold on 3
-            interruptable=False,
-            hold_last=True
-        )
+        self.last_result = self._next_roll(self.selected_index)
+        log.info("Dice: displaying result %s (frames 0..3, hold)", self.last_result)
+        # show 0..3 and hold on 3
+        self._play([(self.result_animator, self.last_result - 1, 0, 4)], hold_last=True)
         self.mode = "result"
 
         # --- Result SFX: fire when result is actually shown ---
+        # (async: nothing waits on it; the next sound started cuts it short)
         try:
             if self.last_result == 1:
                 log.info("Dice: rolled a 1 → guardian down SFX")
-                play_audio("fx/guardiandown.wav", interruptable=True)
+                play_audio_async("fx/guardiandown.wav")
             elif self.last_result == self.MAX_VALS[self.selected_index]:
                 log.info("Dice: rolled max → crit SFX")
-                play_audio("fx/crit.wav", interruptable=True)
+                play_audio_async("fx/crit.wav")
         except Exception as e:
-            log.warning(f"Result SFX failed: {e}")
+            log.warning("Result SFX failed: %s", e)
 
 
     def run(self):
         log.info("Entering Dice Mode")
-        # show the initial selection immediately
+        self._load_assets()
+        # show the initial selection as soon as the sheets are in
         self.mode = "selection"
         self._show_selection()
 
         # idle loop just breathes; events come via handle_event()
-        while not interrupt_requested.is_set():
+        while not interrupt_requested.is_set() and manager.state is self:
             now = time.monotonic()
             if now - self.last_idle_log >= 1.0:
-                log.info(f"Dice: waiting for input… (mode={self.mode}, die={self.dice_names[self.selected_index]})")
+                log.info("Dice: waiting for input… (mode=%s, die=%s)", self.mode, self.dice_names[self.selected_index])
                 self.last_idle_log = now
-            time.sleep(0.05)
+            # sleep until an interrupt arrives (or the next idle log is due)
+            self.idle_wait(interrupt_requested, 1.0)
 
         log.info("Interrupt detected in DiceState — exiting")
-        manager.next_state = IdleState
+        if manager.state is self:  # not already replaced by a dispatched event
+            manager.request(IdleState)
 
     def handle_event(self, evt: str):
         # ignore events until settle window expires (prevents phantom roll on entry)
+        # and while run() is still loading the sheets
+        if not self._ready:
+            log.info("Dice: %s dropped (sheets still loading)", evt)
+            return
         if time.monotonic() < self.settle_until:
             return
 
@@ -928,11 +1294,10 @@ class DiceState(State):
                 # Cycle to next die (with a quick rewind)
                 log.info("Dice: selection → next die")
                 for i in reversed(range(4)):  # 3,2,1,0
-                    frame = self.dice_animator.get_frame(self.selected_index, i)
-                    hw_display.show_image(device, frame)
+                    self._blit(self.selected_index, i)
                     time.sleep(FRAME_RATE)
                 self.selected_index = (self.selected_index + 1) % len(self.dice_names)
-                log.info(f"Dice: selected {self.dice_names[self.selected_index]}")
+                log.info("Dice: selected %s", self.dice_names[self.selected_index])
                 self._show_selection()
                 return
 
@@ -942,17 +1307,15 @@ class DiceState(State):
         if self.mode == "result":
             if evt == "B1_TAP":
                 # Finish just the tail of the current result (frames 3..6),
-                # then start the new roll.
-                self._play_result_strip(start_frame=3)
-                self._roll_current()
+                # then start the new roll — one sequence, no gap between them.
+                self._roll_current(lead_in=self._result_strip(start_frame=3))
                 return
 
             if evt == "B2_TAP":
                 # Finish tail (3..6), then return to selection on the same die.
-                self._play_result_strip(start_frame=3)
                 log.info("Dice: result → back to selection")
                 self.mode = "selection"
-                self._show_selection()
+                self._play(self._result_strip(start_frame=3) + self._selection_strip(), hold_last=True)
                 return
 
             return  # ignore others
@@ -972,99 +1335,83 @@ class QuipState(State):
         name = preloaded["quip_audio_shuffle"].next()
         log.info(f"Quip: audio {name}")
 
-        audio_done = threading.Event()
-        current_col = [preloaded["quip_col_shuffle"].next()]
+        col_shuffle = preloaded["quip_col_shuffle"]
+        col = col_shuffle.next()
         frame_index = 0
 
-        def animate():
-            nonlocal frame_index
-            while not interrupt_requested.is_set() and not audio_done.is_set():
-                frame_index = 0
-                col = current_col[0]
-                frame_index = animator.play_column(
-                    col,
-                    start=0,
-                    end=animator.frames_per_column,
-                    interruptable=True
-                )
-                if audio_done.is_set() or interrupt_requested.is_set():
-                    break
-                # next column (no repeats until cycle completes)
-                current_col[0] = preloaded["quip_col_shuffle"].next()
-
-            # Finish the current column after audio ends (if mid-column)
-            if not interrupt_requested.is_set() and frame_index < animator.frames_per_column:
-                animator.play_column(
-                    current_col[0],
-                    start=frame_index,
-                    end=animator.frames_per_column,
-                    interruptable=False
-                )
-
-        def play_audio_and_flag():
-            play_audio(name, interruptable=True)
-            if not interrupt_requested.is_set():
-                audio_done.set()
-
-        anim_thread = threading.Thread(target=animate, daemon=True)
-        audio_thread = threading.Thread(target=play_audio_and_flag, daemon=True)
-        audio_thread.start()
+        # Start audio without blocking; the player handle doubles as the "done" flag
+        proc = play_audio_async(name)
 
-        if SIM:
-            while not interrupt_requested.is_set() and not audio_done.is_set():
-                frame_index = animator.play_column(
-                    current_col[0],
-                    start=0,
-                    end=animator.frames_per_column,
-                    interruptable=True
-                )
-                if audio_done.is_set() or interrupt_requested.is_set():
-                    break
-                current_col[0] = preloaded["quip_col_shuffle"].next()
-
-            # Finish current column if needed
-            if not interrupt_requested.is_set() and frame_index < animator.frames_per_column:
-                animator.play_column(
-                    current_col[0],
-                    start=frame_index,
-                    end=animator.frames_per_column,
-                    interruptable=False
-                )
-            audio_thread.join()
-        else:
-            anim_thread = threading.Thread(target=animate, daemon=True)
-            anim_thread.start()
-            audio_thread.join()
-            anim_thread.join()
+        # Keep playing columns until the audio ends
+        # (inline: main thread on SIM, state thread on Pi)
+        while not interrupt_requested.is_set() and audio_playing(proc):
+            frame_index = animator.play_column(
+                col,
+                start=0,
+                end=animator.frames_per_column,
+                interruptable=True
+            )
+            if not audio_playing(proc) or interrupt_requested.is_set():
+                break
+            # next column (no repeats until cycle completes)
+            col = col_shuffle.next()
 
-        manager.next_state = IdleState
+        if interrupt_requested.is_set():
+            hw_audio.stop(proc)
+        # Audio ended: finish the current column if mid-column
+        elif frame_index < animator.frames_per_column:
+            animator.play_column(
+                col,
+                start=frame_index,
+                end=animator.frames_per_column,
+                interruptable=False
+            )
+
+        manager.request(IdleState)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Unified edge-based input → event queue (DEBUG-INSTRUMENTED)
 # ──────────────────────────────────────────────────────────────────────────────
-def pump_sim_inputs_once():
-    """Poll SIM keyboard once (must be called from main thread on macOS)."""
+def pump_sim_inputs_once() -> bool:
+    """Poll SIM keyboard once (must be called from main thread on macOS); True if anything was posted."""
+    posted = False
     try:
-        ev = hw_buttons.poll_buttons() or {}
-        for name, truthy in ev.items():
-            if truthy:
-                post_event(name)
+        counts = hw_buttons.poll_buttons()
+        if any(counts):
+            for name, count in zip(hw_buttons.EVENTS, counts):
+                # count = presses this tick; post each so none are lost
+                for _ in range(count):
+                    post_event(name)
+            posted = True
     except Exception as e:
         log.debug(f"SIM input poll error: {e}")
+    return posted
 
 def post_event(name: str):
-    event_queue.put(name)
+    event_queue.append(name)
+    event_wake.set()
 
 # --- Edge queue and callback ---
-edge_queue = queue.Queue()
+# SimpleQueue: C-level put with no condition-variable bookkeeping, so the
+# RPi.GPIO callback thread hands the edge off and returns right away
+edge_queue = queue.SimpleQueue()
+_PIN_TO_BTN = {BUTTON1_PIN: "B1", BUTTON2_PIN: "B2"}
+# level of the last edge queued per pin (None = nothing queued yet)
+_last_queued_level = {BUTTON1_PIN: None, BUTTON2_PIN: None}
 
 def _edge_cb(channel: int):
+    # timestamp first so callback latency doesn't skew pulse widths
+    t = time.monotonic()
     # NOTE: pressed == HIGH for NC + PUD_UP wiring
     level_high = GPIO.input(channel) == GPIO.HIGH
-    btn = "B1" if channel == BUTTON1_PIN else "B2"
-    t = time.monotonic()
+    # Coalesce bounce: by the time we read it, a storm of edges often shows
+    # the level we already queued. That's no transition, so don't wake
+    # input_monitor for it (a duplicate PRESS would also restart the pulse).
+    if level_high is _last_queued_level[channel]:
+        return
+    _last_queued_level[channel] = level_high
     # Queue the logical edge; PRESS when level goes HIGH, RELEASE when LOW
-    edge_queue.put((btn, level_high, t))
+    edge_queue.put((_PIN_TO_BTN[channel], level_high, t))
 
 def _register_edge_callbacks():
     # If a previous run registered events, clear them first
@@ -1085,11 +1432,16 @@ def chord_recent():
     return (time.monotonic() - last_chord_time) < CHORD_TAP_SUPPRESS_WINDOW
 
 def input_monitor():
+    # bound once; every pass reads the clock once into `now` (helpers below
+    # see that same value instead of re-reading it)
+    _mono = time.monotonic
+    now = _mono()
+
     # Per-button timing/state
-    press_time = {"B1": None, "B2": None}   # last press-down time (monotonic)
+    press_time = [None, None]               # last press-down time (monotonic), by _BTN_IDX
     tap_count  = {"B1": 0,    "B2": 0}      # taps within current decision window
     decide_at  = {"B1": None, "B2": None}   # absolute time when we decide TAP/DOUBLE/5x
-    down       = {"B1": False,"B2": False}  # current "pressed" state as seen by our logic
+    down_mask  = 0                          # bit i set = button i "pressed" as seen by our logic
 
     # Cooldown to suppress taps briefly after a HOLD (prevents spurious 5-tap)
     tap_suppress_until = {"B1": 0.0, "B2": 0.0}
@@ -1105,10 +1457,17 @@ def input_monitor():
     CHORD_TIMEOUT = 1.0       # seconds
     global last_chord_time
 
-    # Helper to post with a consistent log
+    # Helper to post with a consistent log; same as post_event() but with the
+    # ring append / wake bound once (deque.append is atomic, no lock needed)
+    _append = event_queue.append
+    _wake = event_wake.set
+    _log_posts = log.isEnabledFor(logging.INFO)
+
     def emit(evt: str):
-        log.info(f"POST {evt}")
-        post_event(evt)
+        if _log_posts:
+            log.info("POST %s", evt)
+        _append(evt)
+        _wake()
 
     # Decide helper: translate tap_count → event
     def decide(button: str):
@@ -1116,301 +1475,291 @@ def input_monitor():
         tap_count[button] = 0
         decide_at[button] = None
         if button == "B1" and n >= 5:
-            log.info(f"DECIDE {button}: {n} taps → B1_5TAP")
+            log.info("DECIDE %s: %s taps → B1_5TAP", button, n)
             emit("B1_5TAP")
         elif button == "B2" and n >= 5:
-            log.info(f"DECIDE {button}: {n} taps → B2_5TAP")
+            log.info("DECIDE %s: %s taps → B2_5TAP", button, n)
             emit("B2_5TAP")
         elif n >= 2:
-            log.info(f"DECIDE {button}: {n} taps → {button}_DOUBLE")
+            log.info("DECIDE %s: %s taps → %s_DOUBLE", button, n, button)
             emit(f"{button}_DOUBLE")
         elif n == 1:
-            log.info(f"DECIDE {button}: {n} tap  → {button}_TAP")
+            log.info("DECIDE %s: %s tap  → %s_TAP", button, n, button)
             emit(f"{button}_TAP")
         else:
-            log.info(f"DECIDE {button}: {n} taps → (nothing)")
+            log.info("DECIDE %s: %s taps → (nothing)", button, n)
+
+    # Chord helpers shared by real and synthesized (resync) edges
+    def _maybe_arm_chord(i: int, t_now: float, synthesized: bool):
+        nonlocal chord_pending, chord_detect_time, chord_armed
+        # Chord detect: both are down, and their press times are close
+        if down_mask == 0b11 and press_time[1 - i] is not None:
+            dt = abs(press_time[i] - press_time[1 - i])
+            if dt <= (CHORD_GRACE_MS / 1000.0) and chord_armed:
+                log.info("%sCHORD pending (dt=%.1fms) — waiting for release", "SYN-" if synthesized else "", dt * 1000)
+                chord_pending = True
+                chord_detect_time = t_now
+                chord_armed = False  # disarm to avoid duplicates
+
+    def _maybe_emit_chord(synthesized: bool):
+        nonlocal chord_pending, chord_detect_time, chord_armed
+        global last_chord_time
+        # Re-arm chord once both are up
+        if down_mask:
+            return
+        if chord_pending:
+            log.info("%sCHORD released → POST B1B2_CHORD", "SYN-" if synthesized else "")
+            emit("B1B2_CHORD")
+            # Clear pending tap logic — don't let B1/B2 post late taps
+            tap_count["B1"] = 0
+            tap_count["B2"] = 0
+            decide_at["B1"] = None
+            decide_at["B2"] = None
+
+            # Record time to suppress near-future taps
+            last_chord_time = now
+
+            chord_pending = False
+            chord_detect_time = None
+        chord_armed = True
+
+    # Classify a finished pulse: IGNORED blip, HOLD, or a tallied tap
+    def _classify_pulse(i: int, pulse_ms: float, t_now: float, synthesized: bool):
+        btn = _BUTTONS[i]
+        hold_ms = _HOLD_MS_TUPLE[i]
+        syn = "SYN-" if synthesized else ""
+        # Ignore very short blips
+        if pulse_ms < MIN_PULSE_MS:
+            log.info("%sIGNORED %s: too short (<%sms)", syn, btn, MIN_PULSE_MS)
+        # HOLD?
+        elif pulse_ms >= hold_ms:
+            log.info("%sHOLD %s detected (≥%sms)", syn, btn, hold_ms)
+            # Holds cancel any in-flight tap decision for that button
+            tap_count[btn] = 0
+            decide_at[btn] = None
+
+            # Start tap cooldown & remember last hold time
+            tap_suppress_until[btn] = now + hold_cooldown_sec
+            last_hold_time[btn] = now
+
+            if btn == "B1":
+                if chord_recent():
+                    log.info("Suppressed %sB1_HOLD — chord was pending or recent", syn)
+                else:
+                    emit("B1_HOLD")
+            else:
+                emit(f"{btn}_HOLD")
+        else:
+            # Count a tap and schedule decision — but only if no chord is pending
+            if not chord_pending and not chord_recent():
+                if now >= tap_suppress_until[btn]:
+                    tap_count[btn] += 1
+                    decide_at[btn] = t_now + TAP_DECISION
+                    log.info(
+                        "%sTap tallied: %s total=%s (decision in %.2fs)",
+                        syn, btn, tap_count[btn], TAP_DECISION
+                    )
+                else:
+                    log.info("%sTap suppressed for %s — within hold cooldown", syn, btn)
+            else:
+                log.info("%sSuppressed tap tally for %s — chord pending", syn, btn)
+
+    # Self-healing edge resync state (debounced + guarded)
+    RESYNC_SAMPLE_MS = 30       # raw mismatch must persist this long
+    RESYNC_COOLDOWN_MS = 120    # min gap between synthesized edges per button
+    # (all indexed by _BTN_IDX)
+    last_raw = [GPIO.input(BUTTON1_PIN) == GPIO.HIGH, GPIO.input(BUTTON2_PIN) == GPIO.HIGH]
+    raw_stable_since = [now, now]
+    last_synth_time = [0.0, 0.0]
+    last_gpio_read = now       # raw pin reads are throttled to RESYNC_SAMPLE_MS
+
+    pins = (BUTTON1_PIN, BUTTON2_PIN)  # by _BTN_IDX, for the edge filter
+
+    def can_synthesize(i: int) -> bool:
+        # require raw mismatch to be stable long enough and respect cooldown
+        stable_ms = (now - raw_stable_since[i]) * 1000.0
+        since_last_syn_ms = (now - last_synth_time[i]) * 1000.0
+        return stable_ms >= RESYNC_SAMPLE_MS and since_last_syn_ms >= RESYNC_COOLDOWN_MS
+
+    # Earliest pending timer (tap decision or chord timeout); inf when idle
+    next_deadline = float("inf")
 
     # Throttled raw sampling log (DEBUG only)
     last_raw_log = 0.0
     RAW_LOG_PERIOD = 0.25  # seconds
 
     while not shutting_down.is_set():
-        # Optional raw read (useful to spot wiring/mode issues)
-        now = time.monotonic()
+        # Optional raw read (useful to spot wiring/mode issues); `now` is from
+        # the end of the previous pass, close enough for throttling/timeouts
         if log.isEnabledFor(logging.DEBUG) and (now - last_raw_log) >= RAW_LOG_PERIOD:
             raw_b1 = GPIO.input(BUTTON1_PIN) == GPIO.HIGH
             raw_b2 = GPIO.input(BUTTON2_PIN) == GPIO.HIGH
-            log.debug(f"RAW B1={int(raw_b1)} RAW B2={int(raw_b2)} (1=pressed)")
+            log.debug("RAW B1=%s RAW B2=%s (1=pressed)", int(raw_b1), int(raw_b2))
             last_raw_log = now
 
-        # 1) Drain exactly one queued edge to keep latency low
+        # 1) Drain exactly one queued edge to keep latency low. Block until the
+        #    next timer is due, but never longer than the resync poll.
         try:
-            btn, is_press, t = edge_queue.get(timeout=0.05)
+            btn, is_press, t = edge_queue.get(timeout=max(0.0, min(0.05, next_deadline - now)))
         except queue.Empty:
             btn = None
+        # refresh once after the (possibly blocking) get
+        now = _mono()
 
         # 2) Process one edge if present
         if btn:
-            other = "B2" if btn == "B1" else "B1"
+            i = _BTN_IDX[btn]
+            bit = 1 << i
 
             if is_press:
                 # PRESS edge (rising to HIGH)
-                down[btn] = True
-                press_time[btn] = t
-                log.info(f"PRESS {btn}")
-
-                # Chord detect: both are down, and their press times are close
-                if down[other] and press_time[other] is not None:
-                    dt = abs(press_time[btn] - press_time[other])
-                    if dt <= (CHORD_GRACE_MS / 1000.0) and chord_armed:
-                        log.info(f"CHORD pending (dt={dt*1000:.1f}ms) — waiting for release")
-                        chord_pending = True
-                        chord_detect_time = time.monotonic()
-                        chord_armed = False  # disarm to avoid duplicates
+                down_mask |= bit
+                press_time[i] = t
+                log.info("PRESS %s", btn)
+                _maybe_arm_chord(i, now, synthesized=False)
 
             else:
                 # RELEASE edge (falling to LOW)
-                if press_time[btn] is None:
+                if press_time[i] is None:
                     # We missed the press edge somehow; still mark up->down transition
-                    if down[btn]:
-                        log.warning(f"RELEASE {btn} detected but press_time was None — forcing release")
-                    down[btn] = False
-                    press_time[btn] = None
+                    if down_mask & bit:
+                        log.warning("RELEASE %s detected but press_time was None — forcing release", btn)
+                    down_mask &= ~bit
                     decide_at[btn] = None
                     tap_count[btn] = 0
                 else:
                     # Clamp stale timestamp (can happen around resync)
-                    if t < press_time[btn]:
-                        log.debug(f"Stale RELEASE for {btn} (edge timestamp < press_time) — clamping")
-                        t = press_time[btn]
-
-                    pulse_ms = (t - press_time[btn]) * 1000.0
-                    down[btn] = False
-                    press_time[btn] = None
-                    log.info(f"RELEASE {btn} (pulse={pulse_ms:.1f}ms)")
-
-                    # Re-arm chord once both are up
-                    if not down["B1"] and not down["B2"]:
-                        if chord_pending:
-                            log.info(f"CHORD released → POST B1B2_CHORD")
-                            emit("B1B2_CHORD")
-                            # Clear pending tap logic — don't let B1/B2 post late taps
-                            tap_count["B1"] = 0
-                            tap_count["B2"] = 0
-                            decide_at["B1"] = None
-                            decide_at["B2"] = None
-
-                            # Record time to suppress near-future taps
-                            last_chord_time = time.monotonic()
-
-                            chord_pending = False
-                            chord_detect_time = None
-                        chord_armed = True
-
-                    # Ignore very short blips
-                    if pulse_ms < MIN_PULSE_MS:
-                        log.info(f"IGNORED {btn}: too short (<{MIN_PULSE_MS}ms)")
-                    # HOLD?
-                    elif pulse_ms >= HOLD_MS_BY_BTN[btn]:
-                        log.info(f"HOLD {btn} detected (≥{HOLD_MS_BY_BTN[btn]}ms)")
-                        # Holds cancel any in-flight tap decision for that button
-                        tap_count[btn] = 0
-                        decide_at[btn] = None
-
-                        # Start tap cooldown & remember last hold time
-                        tap_suppress_until[btn] = time.monotonic() + hold_cooldown_sec
-                        last_hold_time[btn] = time.monotonic()
-
-                        if btn == "B1":
-                            if chord_recent():
-                                log.info("Suppressed B1_HOLD — chord was pending or recent")
-                            else:
-                                emit("B1_HOLD")
-                        else:
-                            emit(f"{btn}_HOLD")
-                    else:
-                        # Count a tap and schedule decision — but only if no chord is pending
-                        if not chord_pending and not chord_recent():
-                            if time.monotonic() >= tap_suppress_until[btn]:
-                                tap_count[btn] += 1
-                                decide_at[btn] = t + TAP_DECISION
-                                log.info(
-                                    f"Tap tallied: {btn} total={tap_count[btn]} "
-                                    f"(decision in {TAP_DECISION:.2f}s)"
-                                )
-                            else:
-                                log.info(f"Tap suppressed for {btn} — within hold cooldown")
-                        else:
-                            log.info(f"Suppressed tap tally for {btn} — chord pending")
+                    if t < press_time[i]:
+                        log.debug("Stale RELEASE for %s (edge timestamp < press_time) — clamping", btn)
+                        t = press_time[i]
 
-        # 3) Finalize any deferred tap decisions whose timers expired
-        now2 = time.monotonic()
-        for b in ("B1", "B2"):
-            if decide_at[b] is not None and now2 >= decide_at[b]:
-                # Suppress tap if shortly after chord
-                if now2 - last_chord_time < CHORD_TAP_SUPPRESS_WINDOW:
-                    log.info(f"Suppressed {b}_TAP — within {CHORD_TAP_SUPPRESS_WINDOW*1000:.0f}ms of chord")
-                    tap_count[b] = 0
-                    decide_at[b] = None
-                    continue
-                decide(b)
-
-        # 4) Timeout check for chord pending
-        if chord_pending and chord_detect_time:
-            if time.monotonic() - chord_detect_time > CHORD_TIMEOUT:
-                log.info("CHORD timeout — discarding pending chord")
-                chord_pending = False
-                chord_detect_time = None
-                chord_armed = True
+                    pulse_ms = (t - press_time[i]) * 1000.0
+                    down_mask &= ~bit
+                    press_time[i] = None
+                    log.info("RELEASE %s (pulse=%.1fms)", btn, pulse_ms)
 
-        # 4b) Self-healing edge resync (debounced + guarded)
-        RESYNC_SAMPLE_MS = 30       # raw mismatch must persist this long
-        RESYNC_COOLDOWN_MS = 120    # min gap between synthesized edges per button
-
-        # one-time init on first loop
-        if not hasattr(input_monitor, "_resync_init"):
-            input_monitor._resync_init = True
-            last_raw = {"B1": GPIO.input(BUTTON1_PIN) == GPIO.HIGH,
-                        "B2": GPIO.input(BUTTON2_PIN) == GPIO.HIGH}
-            raw_stable_since = {"B1": time.monotonic(), "B2": time.monotonic()}
-            last_synth_time = {"B1": 0.0, "B2": 0.0}
-            setattr(input_monitor, "_last_raw", last_raw)
-            setattr(input_monitor, "_raw_stable_since", raw_stable_since)
-            setattr(input_monitor, "_last_synth_time", last_synth_time)
-
-        # load refs
-        last_raw = getattr(input_monitor, "_last_raw")
-        raw_stable_since = getattr(input_monitor, "_raw_stable_since")
-        last_synth_time = getattr(input_monitor, "_last_synth_time")
-
-        # update raw stability tracking
-        raw_now = {
-            "B1": GPIO.input(BUTTON1_PIN) == GPIO.HIGH,
-            "B2": GPIO.input(BUTTON2_PIN) == GPIO.HIGH,
-        }
-        now_mon = time.monotonic()
-        for btn in ("B1", "B2"):
-            if raw_now[btn] != last_raw[btn]:
-                last_raw[btn] = raw_now[btn]
-                raw_stable_since[btn] = now_mon  # reset stability timer
-
-        def can_synthesize(btn: str) -> bool:
-            # require raw mismatch to be stable long enough and respect cooldown
-            stable_ms = (now_mon - raw_stable_since[btn]) * 1000.0
-            since_last_syn_ms = (now_mon - last_synth_time[btn]) * 1000.0
-            return stable_ms >= RESYNC_SAMPLE_MS and since_last_syn_ms >= RESYNC_COOLDOWN_MS
-
-        for btn in ("B1", "B2"):
-            other = "B2" if btn == "B1" else "B1"
-
-            # Synthesize PRESS if raw says pressed but we think it's up
-            if raw_now[btn] and not down[btn] and can_synthesize(btn):
-                down[btn] = True
-                press_time[btn] = now_mon  # may be later than queued RELEASE; guarded below
-                last_synth_time[btn] = now_mon
-                log.warning(f"SYN-PRESS {btn} (resync)")
-                # chord detect window
-                if down[other] and press_time[other] is not None:
-                    dt = abs(press_time[btn] - press_time[other])
-                    if dt <= (CHORD_GRACE_MS / 1000.0) and chord_armed:
-                        log.info(f"SYN-CHORD pending (dt={dt*1000:.1f}ms) — waiting for release")
-                        chord_pending = True
-                        chord_detect_time = now_mon
-                        chord_armed = False
-
-            # Synthesize RELEASE if raw says not pressed but we think it's down
-            if not raw_now[btn] and down[btn] and can_synthesize(btn):
-                t_now = now_mon
-                press_at = press_time[btn] if press_time[btn] is not None else t_now
-                pulse_ms = max(0.0, (t_now - press_at) * 1000.0)  # clamp; never negative
-                down[btn] = False
-                last_synth_time[btn] = t_now
-                log.warning(f"SYN-RELEASE {btn} (pulse={pulse_ms:.1f}ms resync)")
-
-                # Re-arm chord once both are up
-                if not down["B1"] and not down["B2"]:
-                    if chord_pending:
-                        log.info("SYN-CHORD released → POST B1B2_CHORD")
-                        emit("B1B2_CHORD")
-                        tap_count["B1"] = 0; tap_count["B2"] = 0
-                        decide_at["B1"] = None; decide_at["B2"] = None
-                        last_chord_time = time.monotonic()
-                        chord_pending = False
-                        chord_detect_time = None
-                    chord_armed = True
+                    _maybe_emit_chord(synthesized=False)
+                    _classify_pulse(i, pulse_ms, t, synthesized=False)
 
-                # Classify the synthesized pulse
-                if pulse_ms < MIN_PULSE_MS:
-                    log.info(f"SYN-IGNORED {btn}: too short (<{MIN_PULSE_MS}ms)")
-                elif pulse_ms >= HOLD_MS_BY_BTN[btn]:
-                    log.info(f"SYN-HOLD {btn} detected (≥{HOLD_MS_BY_BTN[btn]}ms)")
-                    tap_count[btn] = 0
-                    decide_at[btn] = None
+        # 3) Finalize any deferred tap decisions whose timers expired
+        #    (only scanned once the earliest timer is due)
+        if now >= next_deadline:
+            for b in _BUTTONS:
+                if decide_at[b] is not None and now >= decide_at[b]:
+                    # Suppress tap if shortly after chord
+                    if now - last_chord_time < CHORD_TAP_SUPPRESS_WINDOW:
+                        log.info("Suppressed %s_TAP — within %.0fms of chord", b, CHORD_TAP_SUPPRESS_WINDOW * 1000)
+                        tap_count[b] = 0
+                        decide_at[b] = None
+                        continue
+                    decide(b)
+
+            # 4) Timeout check for chord pending
+            if chord_pending and chord_detect_time:
+                if now - chord_detect_time > CHORD_TIMEOUT:
+                    log.info("CHORD timeout — discarding pending chord")
+                    chord_pending = False
+                    chord_detect_time = None
+                    chord_armed = True
 
-                    # Start tap cooldown & remember last hold time
-                    tap_suppress_until[btn] = time.monotonic() + hold_cooldown_sec
-                    last_hold_time[btn] = time.monotonic()
-
-                    if btn == "B1":
-                        if chord_recent():
-                            log.info("Suppressed SYN B1_HOLD — chord was pending or recent")
-                        else:
-                            emit("B1_HOLD")
-                    else:
-                        emit(f"{btn}_HOLD")
-                else:
-                    if not chord_pending and not chord_recent():
-                        if time.monotonic() >= tap_suppress_until[btn]:
-                            tap_count[btn] += 1
-                            decide_at[btn] = t_now + TAP_DECISION
-                            log.info(f"SYN Tap tallied: {btn} total={tap_count[btn]} (decision in {TAP_DECISION:.2f}s)")
-                        else:
-                            log.info(f"SYN tap suppressed for {btn} — within hold cooldown")
-                    else:
-                        log.info(f"SYN: Suppressed tap tally for {btn} — chord pending")
-                press_time[btn] = None  # clear after use
+        # 4b) Self-healing edge resync (debounced + guarded)
+        if btn:
+            # a real edge just told us the level; no need to read the pins
+            last_raw[i] = is_press
+            raw_stable_since[i] = now
+        elif now - last_gpio_read >= RESYNC_SAMPLE_MS / 1000.0:
+            last_gpio_read = now
+            # update raw stability tracking
+            raw_now = (GPIO.input(BUTTON1_PIN) == GPIO.HIGH, GPIO.input(BUTTON2_PIN) == GPIO.HIGH)
+            for i in (0, 1):
+                if raw_now[i] != last_raw[i]:
+                    last_raw[i] = raw_now[i]
+                    raw_stable_since[i] = now  # reset stability timer
+
+            for i, btn in enumerate(_BUTTONS):
+                bit = 1 << i
+
+                # Synthesize PRESS if raw says pressed but we think it's up
+                if raw_now[i] and not down_mask & bit and can_synthesize(i):
+                    down_mask |= bit
+                    press_time[i] = now  # may be later than queued RELEASE; guarded below
+                    last_synth_time[i] = now
+                    _last_queued_level[pins[i]] = True  # so _edge_cb passes the next real RELEASE
+                    log.warning("SYN-PRESS %s (resync)", btn)
+                    _maybe_arm_chord(i, now, synthesized=True)
+
+                # Synthesize RELEASE if raw says not pressed but we think it's down
+                if not raw_now[i] and down_mask & bit and can_synthesize(i):
+                    t_now = now
+                    press_at = press_time[i] if press_time[i] is not None else t_now
+                    pulse_ms = max(0.0, (t_now - press_at) * 1000.0)  # clamp; never negative
+                    down_mask &= ~bit
+                    last_synth_time[i] = t_now
+                    _last_queued_level[pins[i]] = False  # ...and the next real PRESS
+                    log.warning("SYN-RELEASE %s (pulse=%.1fms resync)", btn, pulse_ms)
+
+                    _maybe_emit_chord(synthesized=True)
+                    _classify_pulse(i, pulse_ms, t_now, synthesized=True)
+                    press_time[i] = None  # clear after use
+
+        # 5) Recompute the single wake-up deadline for the next pass
+        next_deadline = min(
+            (d for d in (decide_at["B1"], decide_at["B2"],
+                         chord_detect_time + CHORD_TIMEOUT if chord_pending and chord_detect_time else None)
+             if d is not None),
+            default=float("inf"),
+        )
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Dispatcher: consume events and route to the active state
 # ──────────────────────────────────────────────────────────────────────────────
-def dispatch_events():
+def dispatch_events() -> bool:
+    """Route everything queued; True if there was anything to route."""
+    event_wake.clear()
+    # Take the whole backlog at once and fold it into at most one transition:
+    # the first event that switches state wins, and set_state() would drop
+    # the rest of the queue anyway
+    pending = []
     while True:
         try:
-            evt = event_queue.get_nowait()
-        except queue.Empty:
+            pending.append(event_queue.popleft())
+        except IndexError:
             break
+    if not pending:
+        return False
+
+    state = manager.state
+    target = None
+    for evt in pending:
 
         # ── Global actions first (with Sleep-aware guards) ──
         if evt == "B1B2_CHORD":
             # Ignore chords while sleeping; otherwise toggle Dice
-            if isinstance(manager.state, SleepState):
+            if isinstance(state, SleepState):
                 log.info("Dispatcher: chord ignored in SleepState")
                 continue
             log.info("Dispatcher: chord B1+B2 → toggle Dice")
-            if isinstance(manager.state, DiceState):
-                manager.set_state(IdleState)
-            else:
-                manager.set_state(DiceState)
-            continue
+            target = IdleState if isinstance(state, DiceState) else DiceState
+            break
         if evt == "B1_HOLD":
             log.info("Dispatcher: B1_HOLD → toggle volume")
             try:
                 global current_volume
                 current_volume = VOLUME_LOW if current_volume == VOLUME_HIGH else VOLUME_HIGH
                 set_pcm_volume(current_volume)
-                play_audio("fx/beep.wav", interruptable=False)
+                play_audio_async("fx/beep.wav")  # don't hold up dispatch for the beep
             except Exception as e:
-                log.warning(f"Volume toggle failed: {e}")
+                log.warning("Volume toggle failed: %s", e)
             continue
     
         if evt == "B2_HOLD":
             log.info("Dispatcher: B2_HOLD → StoryState")
-            manager.set_state(StoryState)
-            continue
+            target = StoryState
+            break
 
         if evt == "B1_5TAP":
-            if not isinstance(manager.state, SleepState):
+            if not isinstance(state, SleepState):
                 log.info("Dispatcher: B1 5-tap → SleepState (with SFX)")
                 # Stop any current animation/audio, then play the sleep cue.
                 interrupt_requested.set()
@@ -1418,10 +1767,10 @@ def dispatch_events():
                     # Block until SFX completes so the user hears it before the screen goes dark.
                     play_audio("fx/revive.wav", interruptable=False)
                 except Exception as e:
-                    log.warning(f"Sleep SFX failed: {e}")
+                    log.warning("Sleep SFX failed: %s", e)
 
-                manager.set_state(SleepState)
-                continue
+                target = SleepState
+                break
             # If already in SleepState, fall through so SleepState.handle_event() can wake
 
         elif evt == "B2_5TAP":
@@ -1429,7 +1778,7 @@ def dispatch_events():
             HOLD_TAP_IGNORE_SEC = 2.0
             since_hold = time.monotonic() - last_hold_time.get("B2", 0.0)
             if since_hold < HOLD_TAP_IGNORE_SEC:
-                log.info(f"Dispatcher: B2_5TAP ignored (within {HOLD_TAP_IGNORE_SEC:.1f}s of B2_HOLD)")
+                log.info("Dispatcher: B2_5TAP ignored (within %.1fs of B2_HOLD)", HOLD_TAP_IGNORE_SEC)
                 continue
 
             log.info("Dispatcher: B2 5-tap → ShutdownState (with SFX)")
@@ -1439,43 +1788,71 @@ def dispatch_events():
                 # Block until SFX completes so it finishes before shutdown begins.
                 play_audio("fx/guardiandown.wav", interruptable=False)
             except Exception as e:
-                log.warning(f"Shutdown SFX failed: {e}")
+                log.warning("Shutdown SFX failed: %s", e)
 
-            manager.set_state(ShutdownState)
-            continue
+            target = ShutdownState
+            break
 
 
         if evt in ("B1_DOUBLE", "B2_DOUBLE"):
             # In DiceState, doubles are handled internally (no global interrupt).
-            if isinstance(manager.state, DiceState):
-                log.info(f"Dispatcher: {evt} in DiceState → no global interrupt")
+            if isinstance(state, DiceState):
+                log.info("Dispatcher: %s in DiceState → no global interrupt", evt)
             else:
-                log.info(f"Dispatcher: {evt} → interrupt_requested")
+                log.info("Dispatcher: %s → interrupt_requested", evt)
                 interrupt_requested.set()
             # fall-through to state handler
 
 
         # ── Forward to the active state's handler ──
         try:
-            state = manager.state
             if state:
                 state.handle_event(evt)
         except Exception as e:
-            log.warning(f"State event handling error for {evt}: {e}")
+            log.warning("State event handling error for %s: %s", evt, e)
+        # the handler switched states itself → the rest belongs to the old state
+        if manager.state is not state:
+            break
+
+    if target is not None:
+        manager.set_state(target)
+    return True
+
+def drain_state_switch() -> bool:
+    """Apply a switch a state requested via manager.request(); True if one happened."""
+    # several requests in one pass → the newest wins; anything the new
+    # state's thread requests afterwards lands in the queue for next pass
+    nxt = None
+    while True:
+        try:
+            nxt = manager.requests.get_nowait()
+        except queue.Empty:
+            break
+    if nxt is None:
+        return False
+    manager.set_state(nxt)  # also drops queued events
+    return True
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Idle watchdog (unchanged)
+# Idle watchdog: a non-blocking check for the main scheduler loop, so it
+# doesn't need a thread of its own waking every 5s (not wired in yet: the
+# baseline never started its thread, so Idle doesn't time out to Sleep)
 # ──────────────────────────────────────────────────────────────────────────────
-def idle_watchdog():
-    last_action = time.monotonic()
-    while not shutting_down.is_set():
-        if isinstance(manager.state, IdleState):
-            if time.monotonic() - last_action > IDLE_TIMEOUT:
-                log.info("Idle timeout — entering SleepState")
-                manager.set_state(SleepState)
-        else:
-            last_action = time.monotonic()
-        time.sleep(5)
+_idle_state = None
+_idle_since = time.monotonic()
+
+def idle_watchdog(now: float) -> bool:
+    """Send a long-untouched Idle to sleep; True if it switched states."""
+    global _idle_state, _idle_since
+    state = manager.state
+    # track the state object, not its type: Idle → Sing → Idle restarts the clock
+    if state is not _idle_state:
+        _idle_state, _idle_since = state, now
+    elif isinstance(state, IdleState) and now - _idle_since > IDLE_TIMEOUT:
+        log.info("Idle timeout — entering SleepState")
+        manager.set_state(SleepState)
+        return True
+    return False
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Main
@@ -1483,7 +1860,7 @@ def idle_watchdog():
 if __name__ == "__main__":
     try:
         # Create window (SIM) / init panel (Pi) on main thread
-        device = hw_display.init_display()
+        open_display()
         manager.set_state(BootState)
 
         def delayed_preload():
@@ -1491,7 +1868,8 @@ if __name__ == "__main__":
             preload_idle_assets()
             preload_sing_assets()
             preload_quip_assets()
-            preload_result_assets()   # ensure DiceState is instant
+            preload_fx_assets()
+            # results.bmp is loaded by DiceState on entry and evicted on exit
 
         threading.Thread(target=delayed_preload, daemon=True).start()
         if not SIM:
@@ -1501,33 +1879,33 @@ if __name__ == "__main__":
         except Exception as e:
             log.warning(f"Initial volume set failed: {e}")
 
-        # Main scheduler loop
+        # Main scheduler loop: one bounded tick per pass (input → events →
+        # state switch); only sleeps when the tick found nothing to do
         while not shutting_down.is_set():
+            did_work = False
             if SIM:
-                pump_sim_inputs_once()  # keep SDL happy (must be main thread)
-            dispatch_events()
-
-            # Consume any pending state switch first
-            if manager.next_state:
-                manager.set_state(manager.next_state)
-                manager.next_state = None
-                try:
-                    while True:
-                        event_queue.get_nowait()
-                except queue.Empty:
-                    pass
+                did_work |= pump_sim_inputs_once()  # keep SDL happy (must be main thread)
+            did_work |= dispatch_events()
+            did_work |= drain_state_switch()
 
             # On macOS SIM we don't spawn state threads.
             # Drive the active state's run() inline on the main thread.
             if SIM and manager.state and manager.thread is None and not manager._inline_running:
                 manager._inline_running = True
+                interrupt_requested.clear()
+                ran = manager.state
                 try:
-                    manager.state.run()  # blocks until the state finishes or is interrupted
+                    ran.run()  # blocks until the state finishes or is interrupted
                 finally:
                     manager._inline_running = False
+                if manager.state is not ran:
+                    # replaced mid-run by an inline dispatch: its exit request is stale
+                    manager.drop_requests()
 
-            # Avoid a hot spin when nothing is running inline
-            time.sleep(0.01 if SIM else 0.05)
+            # Idle pass: events and manager.request() set event_wake, so the
+            # Pi can park; SIM still has to poll SDL on this thread (~60 Hz)
+            if not did_work:
+                event_wake.wait(0.016 if SIM else 0.25)
 
     except KeyboardInterrupt:
         log.info("KeyboardInterrupt received — shutting down")
@@ -1538,7 +1916,7 @@ if __name__ == "__main__":
         # 1) Tell threads/states to stop
         shutting_down.set()
         interrupt_requested.set()
-        manager.next_state = None
+        manager.requests = queue.SimpleQueue()  # drop pending switches
 
         # 2) Wait for current state thread to finish (short timeout)
         try:
@@ -1561,13 +1939,16 @@ if __name__ == "__main__":
 
         # 5) Clean up the display before GPIO cleanup
         try:
-            if device and hasattr(device, "cleanup"):
-                device.cleanup()
+            if device_cleanup:
+                hw_display.flush()
+                device_cleanup()
         except Exception as e:
-            log.warning(f"Device cleanup failed: {e}")
+            log.warning("Device cleanup failed: %s", e)
 
-        # 6) Finally, release GPIO
-        if not SIM:
+        # 6) Finally, release GPIO. Opt-in (GHOST_CLEANUP=1, e.g. for test
+        #    runs that re-init in the same boot): it resets every pin one by
+        #    one, and the process is exiting anyway
+        if not SIM and os.getenv("GHOST_CLEANUP", "0") == "1":
             try:
                 GPIO.cleanup()
             except Exception:
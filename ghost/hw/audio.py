@@ -3,14 +3,108 @@ import subprocess
 import threading
 import logging
 import shlex
+import signal
+import wave
+from collections import OrderedDict
 
 SIM = os.getenv("GHOST_SIM") == "1"
 log = logging.getLogger("GHOST.hw.audio")
 
+# SIM: play through PortAudio in-process when sounddevice is installed
+# (optional; without it every clip shells out to afplay as before)
+_sd = None
+if SIM:
+    try:
+        import numpy as np
+        import sounddevice as _sd
+    except Exception as e:  # ImportError, or OSError if PortAudio itself is missing
+        log.info("sounddevice unavailable (%s); SIM audio uses afplay", e)
+        _sd = None
+
 # Single active player process guard
 _play_lock = threading.Lock()
 _play_proc = None
 
+
+def _stderr_sink():
+    """Only keep a stderr pipe when it'll actually be logged (DEBUG)."""
+    return subprocess.PIPE if log.isEnabledFor(logging.DEBUG) else subprocess.DEVNULL
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SIM in-process player: decoded PCM cache + a Popen-shaped handle, so the
+# single-player guard, stop() and callers' poll() treat it like afplay
+# ──────────────────────────────────────────────────────────────────────────────
+_PCM_CACHE_SIZE = 16                 # decoded clips kept (LRU)
+_pcm_cache = OrderedDict()           # str(path) → (int16 frames×channels, rate)
+
+def _load_pcm(path):
+    """Decode a 16-bit PCM WAV once; later plays reuse the array."""
+    key = str(path)
+    hit = _pcm_cache.get(key)
+    if hit is not None:
+        _pcm_cache.move_to_end(key)
+        return hit
+    with wave.open(key, "rb") as w:
+        if w.getsampwidth() != 2 or w.getcomptype() != "NONE":
+            raise ValueError(f"not 16-bit PCM: {key}")
+        frames = w.readframes(w.getnframes())
+        pcm = np.frombuffer(frames, dtype="<i2").reshape(-1, w.getnchannels())
+        hit = (pcm, w.getframerate())
+    _pcm_cache[key] = hit
+    if len(_pcm_cache) > _PCM_CACHE_SIZE:
+        _pcm_cache.popitem(last=False)
+    return hit
+
+class _PcmPlayer:
+    """One clip on its own PortAudio stream; quacks like the Popen we'd use."""
+    def __init__(self, pcm, rate):
+        self.args = "sounddevice"
+        self.returncode = None
+        self._pcm = pcm
+        self._pos = 0
+        self._done = threading.Event()
+        self._stream = _sd.OutputStream(
+            samplerate=rate, channels=pcm.shape[1], dtype="int16",
+            callback=self._fill, finished_callback=self._done.set,
+        )
+        self._stream.start()
+
+    def _fill(self, outdata, frames, time_info, status):
+        # audio thread: copy the next block, pad with silence at the end
+        chunk = self._pcm[self._pos:self._pos + frames]
+        n = len(chunk)
+        outdata[:n] = chunk
+        self._pos += n
+        if n < frames:
+            outdata[n:] = 0
+            raise _sd.CallbackStop
+
+    def _close(self, rc):
+        if self.returncode is None:
+            self.returncode = rc
+            self._stream.close()
+
+    def poll(self):
+        if self._done.is_set():
+            self._close(0)
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.poll()
+
+    def terminate(self):
+        self._stream.abort()  # drops queued audio; fires finished_callback
+        self._done.set()
+        self._close(-signal.SIGTERM)
+
+    kill = terminate
+
+    def communicate(self, input=None):
+        self.wait()
+        return None, None
+
 def _stop_current_locked():
     global _play_proc
     if _play_proc and _play_proc.poll() is None:
@@ -24,70 +118,115 @@ def _stop_current_locked():
             pass
     _play_proc = None
 
-def stop():
-    """Stop any currently playing audio."""
+def stop(handle=None):
+    """Stop any currently playing audio (or only `handle`, if it's still the active player)."""
     with _play_lock:
-        _stop_current_locked()
+        if handle is None or handle is _play_proc:
+            _stop_current_locked()
 
 def set_volume(level: int):
     """Set output volume. On Pi -> amixer PCM. On SIM -> just log (use Mac volume keys)."""
     if SIM:
-        log.info(f"[SIM] set_volume({level}) (no-op on Mac; use system volume)")
+        log.info("[SIM] set_volume(%s) (no-op on Mac; use system volume)", level)
         return
     try:
         # Card 0, control PCM as per your Pi config/services
         subprocess.run(["amixer", "-c", "0", "sset", "PCM", str(level)], check=False)
     except Exception as e:
-        log.warning(f"amixer failed: {e}")
+        log.warning("amixer failed: %s", e)
 
-def play_wav(path: str):
+def _start_locked(src):
     """
-    Blocking play:
-      - SIM (Mac): /usr/bin/afplay <path>
-      - Pi:        /usr/bin/aplay -D default <path>
-    Only one playback at a time; starting a new one stops the old.
+    Spawn the player for `src` (path or preloaded WAV buffer); caller holds _play_lock.
+    Returns (proc, data) where data is the buffer still to be fed, or (None, None).
     """
     global _play_proc
-    with _play_lock:
-        # stop any previous sound first
-        _stop_current_locked()
+    # anything that isn't a path is treated as a preloaded WAV buffer
+    data = None if isinstance(src, (str, os.PathLike)) else src
 
-        if SIM:
-            cmd = ["/usr/bin/afplay", path]
-        else:
-            cmd = ["/usr/bin/aplay", "-D", "default", path]
+    # stop any previous sound first
+    _stop_current_locked()
 
-        log.info(f"[audio] {' '.join(shlex.quote(c) for c in cmd)}")
-        try:
-            _play_proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-        except FileNotFoundError as e:
-            # Fallback: try without absolute path (PATH may have it)
+    if SIM:
+        if data is not None:
+            log.warning("[SIM] play_wav() needs a path (afplay can't read stdin)")
+            return None, None
+        if _sd is not None:
             try:
-                _play_proc = subprocess.Popen([cmd[0].split('/')[-1], *cmd[1:]],
-                                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-            except Exception as e2:
-                log.warning(f"Audio start failed: {e2}")
+                _play_proc = _PcmPlayer(*_load_pcm(src))
+                log.info("[audio] sounddevice %s", src)
+                return _play_proc, None
+            except Exception as e:
+                log.debug("sounddevice play failed (%s); falling back to afplay", e)
                 _play_proc = None
-                return
-        except Exception as e:
-            log.warning(f"Audio start failed: {e}")
+        cmd = ["/usr/bin/afplay", str(src)]
+    elif data is not None:
+        cmd = ["/usr/bin/aplay", "-q", "-D", "default", "-"]
+    else:
+        cmd = ["/usr/bin/aplay", "-D", "default", str(src)]
+    popen_kw = dict(
+        stdin=subprocess.PIPE if data is not None else None,
+        stdout=subprocess.DEVNULL,
+        stderr=_stderr_sink(),
+    )
+
+    if log.isEnabledFor(logging.INFO):  # skip the quoting work when INFO is off
+        log.info("[audio] %s", " ".join(map(shlex.quote, cmd)))
+    try:
+        _play_proc = subprocess.Popen(cmd, **popen_kw)
+    except FileNotFoundError as e:
+        # Fallback: try without absolute path (PATH may have it)
+        try:
+            _play_proc = subprocess.Popen([cmd[0].split('/')[-1], *cmd[1:]], **popen_kw)
+        except Exception as e2:
+            log.warning("Audio start failed: %s", e2)
             _play_proc = None
-            return
+    except Exception as e:
+        log.warning("Audio start failed: %s", e)
+        _play_proc = None
+    return _play_proc, data
 
-    # wait outside the lock so others can call stop()
+def _finish(proc, data):
+    """Feed the buffer (if any), drain stderr (DEBUG only), reap, and free the active-player slot."""
+    global _play_proc
+    # runs outside the lock so others can call stop();
+    # communicate() writes the buffer, drains any stderr pipe and reaps in one go
     rc = None
+    err = None
     try:
-        rc = _play_proc.wait()
+        _, err = proc.communicate(input=data)
+        rc = proc.returncode
     except Exception:
         pass
     finally:
         with _play_lock:
-            # harvest stderr if nonzero
-            try:
-                if _play_proc:
-                    _, err = _play_proc.communicate(timeout=0.1)
-                    if rc not in (None, 0) and err:
-                        log.debug(f"[audio stderr] {err.decode(errors='ignore').strip()}")
-            except Exception:
-                pass
-            _play_proc = None
+            # log stderr if nonzero
+            if rc not in (None, 0) and err:
+                log.debug("[audio stderr] %s", err.decode(errors="ignore").strip())
+            if _play_proc is proc:
+                _play_proc = None
+
+def play_wav(src):
+    """
+    Blocking play:
+      - SIM (Mac): /usr/bin/afplay <path>
+      - Pi:        /usr/bin/aplay -D default <path>
+                   or, for an in-memory WAV (bytes/mmap), aplay fed over stdin
+    Only one playback at a time; starting a new one stops the old.
+    """
+    with _play_lock:
+        proc, data = _start_locked(src)
+    if proc is not None:
+        _finish(proc, data)
+
+def play_wav_async(src):
+    """
+    Non-blocking play: same players and single-playback rule as play_wav(),
+    but returns the Popen handle right away (None if nothing started).
+    Callers poll() it for completion; feeding/reaping runs on a daemon thread.
+    """
+    with _play_lock:
+        proc, data = _start_locked(src)
+    if proc is not None:
+        threading.Thread(target=_finish, args=(proc, data), daemon=True).start()
+    return proc
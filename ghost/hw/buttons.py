@@ -3,56 +3,63 @@ import os
 
 SIM = os.getenv("GHOST_SIM") == "1"
 
+# Event ids: poll_buttons() reports per-id press counts in a small byte
+# buffer, so the per-tick path never hashes a name or grows a dict
+EVENTS = (
+    "B1_TAP", "B1_DOUBLE", "B1_HOLD",
+    "B2_TAP", "B2_DOUBLE", "B2_HOLD",
+    "B1B2_CHORD", "QUIT",
+)
+BTN_B1_TAP, BTN_B1_DOUBLE, BTN_B1_HOLD, \
+    BTN_B2_TAP, BTN_B2_DOUBLE, BTN_B2_HOLD, \
+    BTN_CHORD, BTN_QUIT = range(len(EVENTS))
+
+# One buffer reused by every poll (no per-tick garbage): callers must read
+# it before the next poll_buttons() call
+_counts = bytearray(len(EVENTS))
+_ZEROS = bytes(len(EVENTS))
+
 if SIM:
     import pygame
 
-    _inited = False
+    # No separate event-subsystem init: display.py's set_mode() brings it up.
 
-    def _ensure_inited():
-        """Make sure pygame's event system is ready. Must be called on the main thread."""
-        global _inited
-        if not _inited:
-            # display.py creates the window; we just ensure event subsystem is ready.
-            try:
-                pygame.event.pump()
-            except Exception:
-                pass
-            _inited = True
-
-    # Keybindings (SIM only)
+    # Keybindings (SIM only): pygame key → event id
     KEYMAP = {
-        pygame.K_1: "B1_TAP",
-        pygame.K_2: "B1_DOUBLE",
-        pygame.K_3: "B1_HOLD",
-        pygame.K_4: "B2_TAP",
-        pygame.K_5: "B2_DOUBLE",
-        pygame.K_6: "B2_HOLD",
-        pygame.K_SPACE: "B1B2_CHORD",
+        pygame.K_1: BTN_B1_TAP,
+        pygame.K_2: BTN_B1_DOUBLE,
+        pygame.K_3: BTN_B1_HOLD,
+        pygame.K_4: BTN_B2_TAP,
+        pygame.K_5: BTN_B2_DOUBLE,
+        pygame.K_6: BTN_B2_HOLD,
+        pygame.K_SPACE: BTN_CHORD,
     }
 
     def poll_buttons():
         """
         SIM: Called from the MAIN THREAD only (via pump_sim_inputs_once()).
-        Returns a dict like {"B1_TAP": True, ...} for any events pressed this tick.
+        Returns the shared count buffer indexed by event id (see EVENTS): how
+        many times each event was pressed since the last tick (repeats aren't
+        folded away). Only valid until the next call.
         """
-        _ensure_inited()
-
-        events = {}
+        events = _counts
+        events[:] = _ZEROS
 
-        # Pump + drain event queue
+        # Drain the event queue (get() pumps SDL itself)
         try:
-            pygame.event.pump()
+            pending = pygame.event.get()
         except Exception:
             # If the window isn't ready yet, just return nothing this tick
             return events
 
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                events["QUIT"] = True
-            elif ev.type == pygame.KEYDOWN:
-                name = KEYMAP.get(ev.key)
-                if name:
-                    events[name] = True
+        keydown, quit_ = pygame.KEYDOWN, pygame.QUIT
+        for ev in pending:
+            if ev.type == keydown:
+                idx = KEYMAP.get(ev.key, -1)
+                if idx >= 0 and events[idx] < 255:
+                    events[idx] += 1
+            elif ev.type == quit_:
+                events[BTN_QUIT] = 1
 
         return events
 
@@ -60,4 +67,4 @@ else:
     # On the Pi, GPIO edges are handled in ghost.ghost:input_monitor().
     # This function simply returns no simulated keyboard events.
     def poll_buttons():
-        return {}
\ No newline at end of file
+        return _ZEROS
@@ -1,10 +1,14 @@
 # display.py
-import os, threading
+import os, threading, queue, logging
+from collections import OrderedDict
 SIM = os.getenv("GHOST_SIM") == "1"
+log = logging.getLogger("GHOST.hw.display")
 
 if SIM:
+    import numpy as np
     import pygame
     _MAIN_IDENT = threading.get_ident()
+    _SURF_CACHE = 4  # PIL images whose converted surfaces are kept
 
     class _PygDisplay:
         def __init__(self, w=240, h=240, title="GHOST SIM"):
@@ -13,20 +17,84 @@ if SIM:
             pygame.init()
             pygame.display.set_caption(title)
             self.size = (w, h)
-            self.screen = pygame.display.set_mode(self.size)
+            # SCALED goes through SDL2's renderer (GPU texture upload, and the
+            # window can be resized without us scaling); DOUBLEBUF → flip swaps
+            try:
+                self.screen = pygame.display.set_mode(self.size, pygame.SCALED | pygame.DOUBLEBUF)
+            except pygame.error as e:
+                log.warning("Accelerated window unavailable (%s); using a plain one", e)
+                self.screen = pygame.display.set_mode(self.size)
+            # Recently shown PIL images → (image, surface, owned), keyed by id().
+            # The image is held in the entry so its id can't be reused meanwhile;
+            # owned surfaces are ours to overwrite once their entry is evicted.
+            self._surfs = OrderedDict()
+            # last raw frame pushed (None = window content unknown)
+            self._prev = None
 
         def display(self, pil_image):
             # All pygame calls must be on the main thread
             assert threading.get_ident() == _MAIN_IDENT, "pygame must be used from main thread"
-            # PIL → pygame surface, blit, flip
-            mode = pil_image.mode  # e.g., "RGB"
-            data = pil_image.tobytes()
-            surf = pygame.image.fromstring(data, pil_image.size, mode)
-            if pil_image.size != self.size:
-                surf = pygame.transform.scale(surf, self.size)
+            # Producers hand over window-sized frames (SpriteAnimator slices
+            # 240×240); a mismatch is a bug upstream, not something to rescale
+            assert pil_image.size == self.size, f"{pil_image.size} != {self.size}"
+            # Same image object again (idle redraws) → just blit + flip. Images
+            # are treated as immutable once shown; draw into a fresh one.
+            hit = self._surfs.get(id(pil_image))
+            if hit is not None and hit[0] is pil_image:
+                self._surfs.move_to_end(id(pil_image))
+                surf = hit[1]
+            else:
+                spare = None
+                if len(self._surfs) >= _SURF_CACHE:
+                    _, old, owned = self._surfs.popitem(last=False)[1]
+                    spare = old if owned else None
+                owned = pil_image.mode == "RGB"
+                if owned:
+                    # Copy pixels straight into a surface we keep (the evicted
+                    # entry's, once the cache is full): no per-frame allocation
+                    # (.convert(): same pixel format as the window → plain copy on blit)
+                    surf = spare or pygame.Surface(self.size).convert()
+                    pygame.pixelcopy.array_to_surface(surf, np.asarray(pil_image).swapaxes(0, 1))
+                else:
+                    # PIL → pygame surface over PIL's one bytes copy (frombuffer doesn't copy again)
+                    surf = pygame.image.frombuffer(pil_image.tobytes(), pil_image.size, pil_image.mode)
+                self._surfs[id(pil_image)] = (pil_image, surf, owned)
+            self._prev = None
             self.screen.blit(surf, (0, 0))
             pygame.display.flip()
 
+        def display_raw(self, buf, size):
+            # Raw RGB888 rows → surface straight over the caller's buffer (no copy)
+            assert threading.get_ident() == _MAIN_IDENT, "pygame must be used from main thread"
+            assert size == self.size, f"{size} != {self.size}"
+            # Frames are treated as immutable once shown (like on the Pi), so
+            # diffing against the previous one gives the region that changed
+            prev, self._prev = self._prev, buf
+            dirty = None
+            if isinstance(buf, np.ndarray) and isinstance(prev, np.ndarray) and prev.shape == buf.shape:
+                if prev is buf:
+                    return  # already on screen
+                # rows from whole-row compares (contiguous reduce); columns
+                # only when the band is small enough for that second pass to pay
+                h, w = buf.shape[:2]
+                rows = np.flatnonzero((buf != prev).reshape(h, -1).any(axis=1))
+                if not rows.size:
+                    return
+                r0, r1 = int(rows[0]), int(rows[-1]) + 1
+                c0, c1 = 0, w
+                if (r1 - r0) * 2 <= h:
+                    cols = np.flatnonzero((buf[r0:r1] != prev[r0:r1]).any(axis=0).any(axis=1))
+                    c0, c1 = int(cols[0]), int(cols[-1]) + 1
+                dirty = pygame.Rect(c0, r0, c1 - c0, r1 - r0)
+            surf = pygame.image.frombuffer(buf, size, "RGB")
+            if dirty is None:
+                self.screen.blit(surf, (0, 0))
+                pygame.display.flip()
+            else:
+                # blit + present just the changed bounding box
+                self.screen.blit(surf, dirty.topleft, dirty)
+                pygame.display.update(dirty)
+
     def init_display():
         # Creates the window on the main thread
         return _PygDisplay(240, 240)
@@ -34,14 +102,86 @@ if SIM:
     def show_image(device, pil_image):
         device.display(pil_image)
 
+    def show_raw(device, buf, w, h):
+        device.display_raw(buf, (w, h))
+
+    def flush():
+        pass  # SIM draws synchronously
+
+    def to_panel(device, frame, axes=(0, 1)):
+        return frame  # the window shows frames as-is
+
+    def show_panel(device, buf):
+        device.display_raw(buf, (buf.shape[1], buf.shape[0]))
+
 else:
     # Real device (Pi) — leave as-is
+    import numpy as np
+    from PIL import Image
     from luma.core.interface.serial import spi
     from luma.lcd.device import st7789
 
+    # Display driver thread: callers hand frames over and go straight back to
+    # preparing the next one while the SPI transfer runs. maxsize=2 is a
+    # double buffer: one frame on the wire, one ready, then producers block.
+    _frames = queue.Queue(maxsize=2)
+    _driver = None
+
+    def _drive():
+        while True:
+            fn, args = _frames.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                log.warning("Display push failed: %s", e)
+            finally:
+                _frames.task_done()
+
     def init_display():
+        global _driver
+        if _driver is None:
+            _driver = threading.Thread(target=_drive, name="ghost-display", daemon=True)
+            _driver.start()
         serial = spi(port=0, device=0, gpio=None)
         return st7789(serial, width=240, height=240, rotate=3)
 
+    def flush():
+        """Wait until every queued frame has reached the panel."""
+        _frames.join()
+
     def show_image(device, pil_image):
-        device.display(pil_image)
\ No newline at end of file
+        _frames.put((device.display, (pil_image,)))
+
+    def show_raw(device, buf, w, h):
+        """Queue a raw RGB888 frame (bytes or contiguous array, must stay unmodified)."""
+        _frames.put((_push_raw, (device, buf, w, h)))
+
+    def to_panel(device, frame, axes=(0, 1)):
+        """
+        Re-lay an (h, w, 3) RGB888 frame the way the panel is scanned, i.e. with
+        luma's rotate already applied, so show_panel() can skip PIL entirely.
+        `axes` are the (row, col) axes, so a whole block of frames (e.g. a
+        sprite sheet laid out as (column, row, h, w[, rgb])) goes in one pass.
+        """
+        # luma rotates by rotate * -90° (PIL: CCW positive) == np.rot90 k=(4-rotate)%4
+        k = (4 - getattr(device, "rotate", 0)) % 4
+        if k == 0:
+            return frame
+        return np.ascontiguousarray(np.rot90(frame, k, axes))
+
+    def show_panel(device, buf):
+        """Queue a to_panel() frame; goes straight to the panel RAM window."""
+        _frames.put((_push_panel, (device, buf)))
+
+    def _push_panel(device, buf):
+        device.set_window(0, 0, buf.shape[1], buf.shape[0])
+        device.data(memoryview(buf).cast("B"))
+
+    def _push_raw(device, buf, w, h):
+        if getattr(device, "rotate", 0) == 0:
+            # Panel takes row-major RGB888 as-is: skip PIL and luma's list() copy
+            device.set_window(0, 0, w, h)
+            device.data(memoryview(buf).cast("B"))
+        else:
+            # luma has to rotate for us → go through a zero-copy PIL wrapper
+            device.display(Image.frombuffer("RGB", (w, h), buf, "raw", "RGB", 0, 1))
\ No newline at end of file